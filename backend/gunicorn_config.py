@@ -12,7 +12,14 @@ backlog = 2048
 # Worker processes
 # Render.com recommendation: 2-4 workers for starter plan, scale up for production
 workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = 'sync'
+# Threaded workers let concurrent uploads overlap their blocking save/read
+# phases instead of serializing on a single sync worker per request
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+# Large documents are also scanned on a per-worker process pool
+# (pii_detector._get_scan_pool) of MAX_SCAN_WORKERS processes, started from
+# a forkserver since these workers are multithreaded. Total scan processes
+# are workers * MAX_SCAN_WORKERS, so lower one when raising the other.
 worker_connections = 1000
 
 # Restart workers after processing this many requests (prevents memory leaks)
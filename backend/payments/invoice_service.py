@@ -2,16 +2,45 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
+import json
+import logging
+import mmap
 import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, Optional
-
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.pdfgen import canvas
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Optional, Tuple
 
+from performance_config import perf_config
 from utils import ensure_dir
 
+logger = logging.getLogger(__name__)
+
+FOOTER_TEXT = "Thank you for choosing PII Sentinel for your privacy automation needs."
+
+# How long a failed render stays available for wait_for() to re-raise
+FAILED_INVOICE_TTL = 300.0
+
+
+@lru_cache(maxsize=1)
+def _pdf_backend():
+    """Import ReportLab on first use and return (canvas, page_size, margin).
+
+    ReportLab is only needed when an invoice is actually rendered, so
+    workers that never handle a payment don't pay for loading it.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.pdfgen import canvas
+
+    return canvas, A4, 20 * mm
+
 
 class InvoiceService:
     """Builds branded invoice PDFs and returns their storage path."""
@@ -21,14 +50,144 @@ class InvoiceService:
         self.company_name = company_name
         ensure_dir(self.base_path)
 
+        # PDFs are rendered and written off the request thread; callers that
+        # need the file on disk block on wait_for().
+        self._pool = ThreadPoolExecutor(
+            max_workers=min(16, perf_config.MAX_IO_WORKERS),
+            thread_name_prefix="invoice-writer",
+        )
+        self._pending: Dict[str, Future] = {}
+        # Failed futures in failure order, with the time they expire
+        self._failed: Dict[str, Tuple[float, Future]] = {}
+        self._pending_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Wait for queued invoices to be written and stop the writer threads."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "InvoiceService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def _build_filepath(self, transaction_id: str) -> str:
         safe_id = transaction_id.replace('/', '-').replace(' ', '')
         return os.path.join(self.base_path, f"Invoice-{safe_id}.pdf")
 
     def generate(self, payload: Dict[str, Any]) -> str:
+        """Queue the invoice for rendering and return its target path.
+
+        The file is written asynchronously; use wait_for(path) before
+        reading it.
+        """
         transaction_id = payload.get('transaction_id') or datetime.utcnow().strftime('%Y%m%d%H%M%S')
         filepath = self._build_filepath(transaction_id)
 
+        future = self._pool.submit(self._render_and_write, filepath, payload)
+        with self._pending_lock:
+            self._pending[filepath] = future
+            self._failed.pop(filepath, None)
+            self._evict_failed(time.monotonic())
+        future.add_done_callback(lambda f, path=filepath: self._on_done(path, f))
+
+        return filepath
+
+    def wait_for(self, filepath: str, timeout: Optional[float] = None) -> str:
+        """Block until the invoice at ``filepath`` is on disk.
+
+        Re-raises any error from rendering or writing the PDF.
+        """
+        with self._pending_lock:
+            future = self._pending.get(filepath)
+        if future is not None:
+            future.result(timeout=timeout)
+            with self._pending_lock:
+                if self._pending.get(filepath) is future:
+                    del self._pending[filepath]
+        return filepath
+
+    def _on_done(self, filepath: str, future: Future) -> None:
+        # Failed futures are kept for FAILED_INVOICE_TTL so wait_for() can
+        # surface the error, then dropped so failures cannot pile up.
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Invoice generation failed for {filepath}: {error}")
+        now = time.monotonic()
+        with self._pending_lock:
+            if error is not None and self._pending.get(filepath) is future:
+                self._failed.pop(filepath, None)
+                self._failed[filepath] = (now + FAILED_INVOICE_TTL, future)
+            elif self._pending.get(filepath) is future:
+                del self._pending[filepath]
+            self._evict_failed(now)
+
+    def _evict_failed(self, now: float) -> None:
+        """Drop expired failures; the caller holds _pending_lock."""
+        while self._failed:
+            filepath, (expires, future) = next(iter(self._failed.items()))
+            if expires > now:
+                break
+            del self._failed[filepath]
+            if self._pending.get(filepath) is future:
+                del self._pending[filepath]
+
+    def _content_path(self, payload: Dict[str, Any]) -> str:
+        """Content-addressed location for the PDF rendered from ``payload``."""
+        canonical = json.dumps(
+            {'company_name': self.company_name, 'payload': payload},
+            sort_keys=True,
+            default=str,
+        ).encode('utf-8')
+        return os.path.join(self.base_path, f"{hashlib.sha256(canonical).hexdigest()}.pdf")
+
+    def _render_and_write(self, filepath: str, payload: Dict[str, Any]) -> None:
+        # Identical payloads (retries, resends) reuse the already rendered
+        # PDF; the invoice path is a hard link to the content-addressed copy.
+        cached_path = self._content_path(payload)
+        if not os.path.exists(cached_path):
+            tmp_path = f"{cached_path}.{uuid.uuid4().hex}.tmp"
+            self._write_pdf(tmp_path, self._render_pdf(payload))
+            os.replace(tmp_path, cached_path)
+        self._link(cached_path, filepath)
+
+    @staticmethod
+    def _link(src: str, dst: str) -> None:
+        """Atomically point ``dst`` at ``src``, copying if hard links fail."""
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            return
+        tmp_path = f"{dst}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        try:
+            os.replace(tmp_path, dst)
+        finally:
+            # rename() is a no-op when both names already share an inode
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _render_pdf(self, payload: Dict[str, Any]) -> memoryview:
+        buffer = io.BytesIO()
+        self.generate_to_stream(payload, buffer)
+        return buffer.getbuffer()
+
+    def generate_to_stream(self, payload: Dict[str, Any], stream: BinaryIO) -> None:
+        """Render the invoice straight into a writable binary stream.
+
+        Lets download handlers write the PDF into the response body (or a
+        SpooledTemporaryFile) without a round trip through base_path.
+        """
+        canvas, page_size, _ = _pdf_backend()
+        # invariant=1 pins the creation date and document ID so the same
+        # payload always renders to the same bytes
+        c = canvas.Canvas(stream, pagesize=page_size, pageCompression=1, invariant=1)
+        self._draw(c, payload)
+        c.showPage()
+        c.save()
+
+    def _draw(self, c, payload: Dict[str, Any]) -> None:
         invoice_date = payload.get('timestamp')
         if isinstance(invoice_date, datetime):
             invoice_date = invoice_date.strftime('%Y-%m-%d %H:%M:%S UTC')
@@ -39,92 +198,100 @@ class InvoiceService:
         purchase = payload.get('purchase', {})
         notes = payload.get('notes', {})
 
-        c = canvas.Canvas(filepath, pagesize=A4)
-        width, height = A4
-        margin = 20 * mm
-        y = height - margin
+        _, page_size, margin = _pdf_backend()
+        height = page_size[1]
+
+        # All body text goes into a single text object (one BT/ET block).
+        # Lines advance by a fixed 12pt leading; larger gaps use moveCursor.
+        text = c.beginText(margin, height - margin)
 
         # Header
-        c.setFont("Helvetica-Bold", 18)
-        c.drawString(margin, y, self.company_name)
-        y -= 14
+        text.setFont("Helvetica-Bold", 18, leading=12)
+        text.textLine(self.company_name)
+        text.moveCursor(0, 2)
 
-        c.setFont("Helvetica", 10)
-        c.drawString(margin, y, "Anoryx Tech Solutions Pvt Ltd")
-        y -= 12
-        c.drawString(margin, y, "Invoice")
-        y -= 20
+        text.setFont("Helvetica", 10, leading=12)
+        text.textLine("Anoryx Tech Solutions Pvt Ltd")
+        text.textLine("Invoice")
+        text.moveCursor(0, 8)
 
         # Invoice meta
-        c.setFont("Helvetica", 9)
-        c.drawString(margin, y, f"Invoice Date: {invoice_date}")
-        y -= 12
-        c.drawString(margin, y, f"Invoice ID: {payload.get('transaction_id', 'NA')}")
-        y -= 12
-        c.drawString(margin, y, f"Order ID: {payload.get('order_id', 'NA')}")
-        y -= 20
+        text.setFont("Helvetica", 9, leading=12)
+        text.textLine(f"Invoice Date: {invoice_date}")
+        text.textLine(f"Invoice ID: {payload.get('transaction_id', 'NA')}")
+        text.textLine(f"Order ID: {payload.get('order_id', 'NA')}")
+        text.moveCursor(0, 8)
 
         # Bill to
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(margin, y, "Billed To:")
-        y -= 14
-        c.setFont("Helvetica", 9)
-        c.drawString(margin, y, f"Name: {user_info.get('name', user_info.get('email', 'Customer'))}")
-        y -= 12
-        c.drawString(margin, y, f"Email: {user_info.get('email', 'NA')}")
-        y -= 12
+        text.setFont("Helvetica-Bold", 11, leading=12)
+        text.textLine("Billed To:")
+        text.moveCursor(0, 2)
+        text.setFont("Helvetica", 9, leading=12)
+        text.textLine(f"Name: {user_info.get('name', user_info.get('email', 'Customer'))}")
+        text.textLine(f"Email: {user_info.get('email', 'NA')}")
         if user_info.get('company'):
-            c.drawString(margin, y, f"Company: {user_info.get('company')}")
-            y -= 12
+            text.textLine(f"Company: {user_info.get('company')}")
         if user_info.get('phone'):
-            c.drawString(margin, y, f"Phone: {user_info.get('phone')}")
-            y -= 12
-        y -= 10
+            text.textLine(f"Phone: {user_info.get('phone')}")
+        text.moveCursor(0, 10)
 
         # Purchase summary
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(margin, y, "Purchase Summary")
-        y -= 14
-        c.setFont("Helvetica", 9)
-        c.drawString(margin, y, f"Type: {purchase.get('type', 'Plan')} ")
-        y -= 12
+        text.setFont("Helvetica-Bold", 11, leading=12)
+        text.textLine("Purchase Summary")
+        text.moveCursor(0, 2)
+        text.setFont("Helvetica", 9, leading=12)
+        text.textLine(f"Type: {purchase.get('type', 'Plan')} ")
         if purchase.get('name'):
-            c.drawString(margin, y, f"Name: {purchase.get('name')}")
-            y -= 12
+            text.textLine(f"Name: {purchase.get('name')}")
         if purchase.get('tokens') is not None:
-            c.drawString(margin, y, f"Tokens: {purchase.get('tokens')}")
-            y -= 12
+            text.textLine(f"Tokens: {purchase.get('tokens')}")
         if purchase.get('details'):
-            c.drawString(margin, y, f"Details: {purchase.get('details')}")
-            y -= 12
-        y -= 10
+            text.textLine(f"Details: {purchase.get('details')}")
+        text.moveCursor(0, 10)
 
         # Payment details
         amount_inr = payload.get('amount_inr', 0)
         currency = payload.get('currency', 'INR')
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(margin, y, "Payment Details")
-        y -= 14
-        c.setFont("Helvetica", 9)
-        c.drawString(margin, y, f"Amount Paid: {amount_inr:.2f} {currency}")
-        y -= 12
-        c.drawString(margin, y, f"Razorpay Payment ID: {payload.get('razorpay_payment_id', 'NA')}")
-        y -= 12
+        text.setFont("Helvetica-Bold", 11, leading=12)
+        text.textLine("Payment Details")
+        text.moveCursor(0, 2)
+        text.setFont("Helvetica", 9, leading=12)
+        text.textLine(f"Amount Paid: {amount_inr:.2f} {currency}")
+        text.textLine(f"Razorpay Payment ID: {payload.get('razorpay_payment_id', 'NA')}")
         if payload.get('razorpay_order_id'):
-            c.drawString(margin, y, f"Razorpay Order ID: {payload.get('razorpay_order_id')}")
-            y -= 12
+            text.textLine(f"Razorpay Order ID: {payload.get('razorpay_order_id')}")
         if notes:
-            c.drawString(margin, y, "Notes:")
-            y -= 12
+            text.textLine("Notes:")
+            text.moveCursor(12, 0)
             for key, value in notes.items():
-                c.drawString(margin + 12, y, f"{key}: {value}")
-                y -= 12
+                text.textLine(f"{key}: {value}")
+
+        c.drawText(text)
 
         c.setFont("Helvetica-Oblique", 8)
-        footer_text = "Thank you for choosing PII Sentinel for your privacy automation needs."
-        c.drawString(margin, margin, footer_text)
+        c.drawString(margin, margin, FOOTER_TEXT)
 
-        c.showPage()
-        c.save()
+    @staticmethod
+    def _write_pdf(filepath: str, data: memoryview) -> None:
+        """Commit the rendered PDF with a single memory-mapped copy.
 
-        return filepath
+        Falls back to a plain buffered write where mmap is unavailable
+        (non-POSIX platforms, some network filesystems).
+        """
+        size = len(data)
+        if size:
+            try:
+                fd = os.open(filepath, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    os.ftruncate(fd, size)
+                    with mmap.mmap(fd, size) as mapped:
+                        mapped[:] = data
+                        mapped.flush()
+                finally:
+                    os.close(fd)
+                return
+            except (OSError, ValueError, AttributeError):
+                pass
+
+        with open(filepath, 'wb') as f:
+            f.write(data)
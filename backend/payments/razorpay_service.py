@@ -2,16 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
+import hmac
 import logging
 import os
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
-try:
-    import razorpay  # type: ignore
-except ImportError:  # pragma: no cover - handled gracefully
-    razorpay = None
-
 logger = logging.getLogger(__name__)
 
 
@@ -45,14 +42,15 @@ class RazorpayService:
     ⚠️ IMPORTANT: Use LIVE keys for production, TEST keys for development
     """
 
+    # Razorpay SDK module, imported on first use (False if not installed)
+    _sdk = None
+
     def __init__(self, key_id: Optional[str], key_secret: Optional[str]):
         self.key_id = (key_id or '').strip()
         self.key_secret = (key_secret or '').strip()
         self._client = None
-
-        if razorpay is None:
-            logger.warning("Razorpay SDK not installed. Run: pip install razorpay")
-            return
+        # Pre-keyed HMAC; copy() per verification skips the key schedule
+        self._hmac_template = hmac.new(self.key_secret.encode('utf-8'), digestmod=hashlib.sha256)
 
         if self.key_id and self.key_secret:
             # Validate key format
@@ -62,7 +60,28 @@ class RazorpayService:
                 logger.info("✓ Using Razorpay LIVE key - Ready for production payments")
             else:
                 logger.warning("⚠️  Razorpay key format not recognized. Expected: rzp_live_xxxxx or rzp_test_xxxxx")
-            
+        else:
+            logger.warning("Razorpay credentials not provided. Payment flows disabled.")
+
+    @classmethod
+    def _load_sdk(cls):
+        """Import the Razorpay SDK once per process; None if unavailable."""
+        if cls._sdk is None:
+            try:
+                import razorpay  # type: ignore
+            except ImportError:  # pragma: no cover - handled gracefully
+                logger.warning("Razorpay SDK not installed. Run: pip install razorpay")
+                razorpay = False
+            cls._sdk = razorpay
+        return cls._sdk or None
+
+    def _get_client(self):
+        """Create the SDK client on first use."""
+        if self._client is None:
+            razorpay = self._load_sdk()
+            if razorpay is None or not (self.key_id and self.key_secret):
+                return None
+
             self._client = razorpay.Client(auth=(self.key_id, self.key_secret))
             
             # Optional: Set app details for Razorpay dashboard analytics
@@ -73,13 +92,12 @@ class RazorpayService:
                 })
             except Exception:
                 logger.debug("Unable to set Razorpay app details", exc_info=True)
-        else:
-            logger.warning("Razorpay credentials not provided. Payment flows disabled.")
+        return self._client
 
     @property
     def enabled(self) -> bool:
         """Check if Razorpay is properly configured and ready."""
-        return self._client is not None
+        return self._get_client() is not None
 
     @classmethod
     def from_env(cls) -> "RazorpayService":
@@ -139,7 +157,7 @@ class RazorpayService:
         logger.info(f"Creating Razorpay order: ₹{amount_inr} ({amount_paise} paise)")
         
         try:
-            order = self._client.order.create(payload)
+            order = self._get_client().order.create(payload)
             logger.info(f"✓ Razorpay order created: {order.get('id')}")
             
             return RazorpayOrderDetails(
@@ -187,16 +205,18 @@ class RazorpayService:
             raise RazorpayNotConfigured("Razorpay client not configured")
 
         try:
-            # Razorpay utility function to verify signature
-            params_dict = {
-                'razorpay_order_id': razorpay_order_id,
-                'razorpay_payment_id': razorpay_payment_id,
-                'razorpay_signature': razorpay_signature
-            }
-            
-            self._client.utility.verify_payment_signature(params_dict)
-            logger.info(f"✓ Payment signature verified: {razorpay_payment_id}")
-            return True
+            # Razorpay signs "<order_id>|<payment_id>" with HMAC-SHA256 using the
+            # key secret; compute it directly on bytes instead of via the SDK.
+            mac = self._hmac_template.copy()
+            mac.update(f"{razorpay_order_id}|{razorpay_payment_id}".encode('utf-8'))
+            expected = mac.hexdigest()
+
+            if hmac.compare_digest(expected, razorpay_signature or ''):
+                logger.info(f"✓ Payment signature verified: {razorpay_payment_id}")
+                return True
+
+            logger.error(f"❌ Payment signature verification failed: {razorpay_payment_id}")
+            return False
             
         except Exception as e:
             logger.error(f"❌ Payment signature verification failed: {e}", exc_info=True)
@@ -216,7 +236,7 @@ class RazorpayService:
             raise RazorpayNotConfigured("Razorpay client not configured")
 
         try:
-            payment = self._client.payment.fetch(payment_id)
+            payment = self._get_client().payment.fetch(payment_id)
             return payment
         except Exception as e:
             logger.error(f"Failed to fetch payment {payment_id}: {e}", exc_info=True)
@@ -4,42 +4,67 @@ Enables ultra-fast processing of 1000+ files with optimized parallel execution.
 """
 import os
 import multiprocessing
+from dataclasses import dataclass
+from typing import Tuple
+
+
+_CPU_COUNT = multiprocessing.cpu_count()
+
+# Parse every setting from one snapshot of the environment so workers forked
+# after import all see the same configuration. Released once the class is built.
+_env = dict(os.environ)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(_env.get(name, default))
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return _env.get(name, default).lower() == 'true'
+
 
 # Simplified and aggressive performance settings for maximum throughput.
 # These values are set high to prioritize speed.
 
+@dataclass(frozen=True, slots=True)
 class PerformanceConfig:
     # ============================================================================
     # Core Parallel Processing Settings
     # ============================================================================
-    CPU_COUNT = multiprocessing.cpu_count()
+    CPU_COUNT: int = _CPU_COUNT
 
     # Aggressively high worker counts for I/O and CPU tasks.
-    MAX_IO_WORKERS = int(os.getenv('MAX_IO_WORKERS', 200))
-    MAX_CPU_WORKERS = int(os.getenv('MAX_CPU_WORKERS', CPU_COUNT * 4))
-    MAX_CONCURRENT_FILES = int(os.getenv('MAX_CONCURRENT_FILES', 256))
+    MAX_IO_WORKERS: int = _env_int('MAX_IO_WORKERS', 200)
+    MAX_CPU_WORKERS: int = _env_int('MAX_CPU_WORKERS', _CPU_COUNT * 4)
+    MAX_CONCURRENT_FILES: int = _env_int('MAX_CONCURRENT_FILES', 256)
+    # Processes in each gunicorn worker's scan_text_parallel pool
+    MAX_SCAN_WORKERS: int = _env_int('MAX_SCAN_WORKERS', min(_CPU_COUNT, 4))
 
     # ============================================================================
     # OCR and PII Detection Settings
     # ============================================================================
-    OCR_QUANTIZED = os.getenv('OCR_QUANTIZED', 'True').lower() == 'true'
-    USE_GPU_OCR = os.getenv('USE_GPU_OCR', 'false').lower() == 'true'
-    PDF_DPI = int(os.getenv('PDF_DPI', 150)) # Lower DPI for faster processing
-    REGEX_CACHING = os.getenv('REGEX_CACHING', 'True').lower() == 'true'
-    SMART_TYPE_DETECTION = os.getenv('SMART_TYPE_DETECTION', 'True').lower() == 'true'
+    OCR_QUANTIZED: bool = _env_bool('OCR_QUANTIZED', 'True')
+    USE_GPU_OCR: bool = _env_bool('USE_GPU_OCR', 'false')
+    PDF_DPI: int = _env_int('PDF_DPI', 150) # Lower DPI for faster processing
+    REGEX_CACHING: bool = _env_bool('REGEX_CACHING', 'True')
+    SMART_TYPE_DETECTION: bool = _env_bool('SMART_TYPE_DETECTION', 'True')
 
     # ============================================================================
     # Error Handling and Timeouts
     # ============================================================================
-    FILE_TIMEOUT = int(os.getenv('FILE_TIMEOUT', 45)) # Shorter timeout per file
-    JOB_TIMEOUT = int(os.getenv('JOB_TIMEOUT', 3600))
-    RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', 1)) # Reduce retries to fail faster
+    FILE_TIMEOUT: int = _env_int('FILE_TIMEOUT', 45) # Shorter timeout per file
+    JOB_TIMEOUT: int = _env_int('JOB_TIMEOUT', 3600)
+    RETRY_ATTEMPTS: int = _env_int('RETRY_ATTEMPTS', 1) # Reduce retries to fail faster
     
     # ============================================================================
     # Caching & Network
     # ============================================================================
-    REDIS_CACHING = os.getenv('REDIS_CACHING', 'false').lower() == 'true'
-    CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000,http://127.0.0.1:3000').split(',')
+    REDIS_CACHING: bool = _env_bool('REDIS_CACHING', 'false')
+    CORS_ORIGINS: Tuple[str, ...] = tuple(
+        _env.get('CORS_ORIGINS', 'http://localhost:3000,http://127.0.0.1:3000').split(',')
+    )
+
+del _env, _env_int, _env_bool
 
 perf_config = PerformanceConfig()
 
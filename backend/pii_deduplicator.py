@@ -4,11 +4,46 @@ Remove duplicate PIIs but keep all bounding boxes for masking
 """
 
 import logging
+import sys
+from itertools import groupby
 from typing import List, Dict, Any, Tuple
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Above this many matches, display deduplication switches to pandas
+VECTORIZE_THRESHOLD = 500
+
+# Groups with at most this many distinct value lengths use the substring
+# index in remove_substring_duplicates; its size grows with value length
+# times the number of lengths, so wider groups fall back to a scan
+SUBSTRING_INDEX_MAX_LENGTHS = 3
+
+# Interned type names: grouping keys reuse one string object (and its
+# cached hash) per type instead of a fresh str from every .upper() call
+_KNOWN_TYPES = {
+    t: sys.intern(t)
+    for t in ('AADHAAR', 'PAN', 'PHONE', 'EMAIL', 'UPI', 'GST', 'IFSC', 'UNKNOWN')
+}
+
+
+def _intern_type(pii_type: str) -> str:
+    """Upper-case a PII type and return its interned form"""
+    upper = pii_type.upper()
+    return _KNOWN_TYPES.get(upper) or sys.intern(upper)
+
+
+# Every byte except ASCII 0-9, for bytes.translate(None, delete=...)
+_NON_DIGIT_BYTES = bytes(i for i in range(256) if not 48 <= i <= 57)
+
+
+def _digits_only(value: str) -> str:
+    """Strip everything but digits from a string"""
+    if value.isascii():
+        return value.encode('ascii').translate(None, _NON_DIGIT_BYTES).decode('ascii')
+    # Non-ASCII input may contain other Unicode digits; keep str.isdigit semantics
+    return ''.join(c for c in value if c.isdigit())
+
 
 def normalize_pii_value(value: str, pii_type: str) -> str:
     """
@@ -24,10 +59,10 @@ def normalize_pii_value(value: str, pii_type: str) -> str:
     # For specific PII types, apply additional normalization
     if pii_type.upper() == "AADHAAR":
         # Remove all non-digits
-        normalized = ''.join(c for c in normalized if c.isdigit())
+        normalized = _digits_only(normalized)
     elif pii_type.upper() == "PHONE":
         # Remove country code prefixes
-        normalized = ''.join(c for c in normalized if c.isdigit())
+        normalized = _digits_only(normalized)
         if normalized.startswith("91") and len(normalized) > 10:
             normalized = normalized[-10:]  # Keep last 10 digits
     elif pii_type.upper() in ["EMAIL", "UPI"]:
@@ -36,6 +71,80 @@ def normalize_pii_value(value: str, pii_type: str) -> str:
     return normalized
 
 
+def _annotate_normalized(pii_matches: List[Dict[str, Any]]) -> None:
+    """
+    Cache the upper-cased type and normalized value on each PII dict
+    so later pipeline stages don't recompute them
+    """
+    for pii in pii_matches:
+        pii_type = pii.get('type', 'UNKNOWN')
+        pii['_type_u'] = _intern_type(pii_type)
+        pii['_norm'] = normalize_pii_value(pii.get('value', ''), pii_type)
+
+
+def _strip_normalized(pii_matches: List[Dict[str, Any]]) -> None:
+    """Remove the temporary keys added by _annotate_normalized"""
+    for pii in pii_matches:
+        pii.pop('_type_u', None)
+        pii.pop('_norm', None)
+
+
+def _pii_type(pii: Dict[str, Any]) -> str:
+    """Return the upper-cased PII type, using the cached value when present"""
+    return pii.get('_type_u') or _intern_type(pii.get('type', 'UNKNOWN'))
+
+
+def _pii_key(pii: Dict[str, Any]) -> Tuple[str, str]:
+    """Return (TYPE, normalized_value), using cached values when present"""
+    if '_norm' in pii:
+        return pii['_type_u'], pii['_norm']
+    pii_type = pii.get('type', 'UNKNOWN')
+    return _intern_type(pii_type), normalize_pii_value(pii.get('value', ''), pii_type)
+
+
+def _group_vectorized(pii_matches: List[Dict[str, Any]]):
+    """
+    Group PIIs by (TYPE, normalized_value) with pandas string ops
+    
+    Mirrors normalize_pii_value column-wise. Returns the same
+    key -> display entry mapping as the loop in deduplicate_piis, in
+    first-occurrence order, or None if pandas is unavailable.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    
+    if all('_norm' in pii for pii in pii_matches):
+        types = pd.Series([pii['_type_u'] for pii in pii_matches], dtype=object)
+        norms = pd.Series([pii['_norm'] for pii in pii_matches], dtype=object)
+    else:
+        types = pd.Series([pii.get('type', 'UNKNOWN') for pii in pii_matches], dtype=object).str.upper()
+        values = pd.Series([pii.get('value', '') or '' for pii in pii_matches], dtype=object)
+        norms = values.str.replace(r'[ \-_]', '', regex=True)
+        
+        digits_only = types.isin(['AADHAAR', 'PHONE'])
+        norms[digits_only] = norms[digits_only].str.replace(r'\D', '', regex=True)
+        
+        country_code = types.eq('PHONE') & norms.str.startswith('91') & (norms.str.len() > 10)
+        norms[country_code] = norms[country_code].str[-10:]
+        
+        lowercase = types.isin(['EMAIL', 'UPI'])
+        norms[lowercase] = norms[lowercase].str.lower()
+    
+    df = pd.DataFrame({'type': types, 'norm': norms})
+    sizes = df.groupby(['type', 'norm'], sort=False, dropna=False)['type'].transform('size')
+    first = ~df.duplicated(['type', 'norm'])
+    
+    seen_piis = {}
+    for idx, pii_type, norm, size in zip(df.index[first], df['type'][first], df['norm'][first], sizes[first]):
+        entry = pii_matches[idx].copy()
+        entry['occurrence_count'] = int(size)
+        entry['is_deduplicated'] = bool(size > 1)
+        seen_piis[(pii_type, norm)] = entry
+    return seen_piis
+
+
 def deduplicate_piis(pii_matches: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Deduplicate PIIs for display while keeping all instances for masking
@@ -53,40 +162,32 @@ def deduplicate_piis(pii_matches: List[Dict[str, Any]]) -> Tuple[List[Dict[str,
     all_piis_for_masking = pii_matches.copy()
     
     # Create deduplicated list for display
-    seen_piis = {}  # key: (type, normalized_value), value: first occurrence
-    display_piis = []
-    duplicate_count = defaultdict(int)
-    
-    for pii in pii_matches:
-        pii_type = pii.get('type', 'UNKNOWN')
-        pii_value = pii.get('value', '')
-        
-        # Normalize the value
-        normalized_value = normalize_pii_value(pii_value, pii_type)
-        
-        # Create unique key
-        key = (pii_type.upper(), normalized_value)
+    seen_piis = None  # key: (type, normalized_value), value: display entry
+    if len(pii_matches) > VECTORIZE_THRESHOLD:
+        seen_piis = _group_vectorized(pii_matches)
+    
+    if seen_piis is not None:
+        display_piis = list(seen_piis.values())
+    else:
+        seen_piis = {}
+        display_piis = []
         
-        if key not in seen_piis:
-            # First occurrence - add to display list
-            seen_piis[key] = pii
+        for pii in pii_matches:
+            # Unique key: (TYPE, normalized value)
+            key = _pii_key(pii)
             
-            # Add occurrence count field
-            pii_copy = pii.copy()
-            pii_copy['occurrence_count'] = 1
-            pii_copy['is_deduplicated'] = False
-            display_piis.append(pii_copy)
-        else:
-            # Duplicate found - increment count
-            duplicate_count[key] += 1
-            
-            # Update the occurrence count in the display list
-            for display_pii in display_piis:
-                if (display_pii.get('type', '').upper(), 
-                    normalize_pii_value(display_pii.get('value', ''), display_pii.get('type', ''))) == key:
-                    display_pii['occurrence_count'] = display_pii.get('occurrence_count', 1) + 1
-                    display_pii['is_deduplicated'] = True
-                    break
+            entry = seen_piis.get(key)
+            if entry is None:
+                # First occurrence - add to display list
+                pii_copy = pii.copy()
+                pii_copy['occurrence_count'] = 1
+                pii_copy['is_deduplicated'] = False
+                seen_piis[key] = pii_copy
+                display_piis.append(pii_copy)
+            else:
+                # Duplicate found - bump the count on the display entry directly
+                entry['occurrence_count'] += 1
+                entry['is_deduplicated'] = True
     
     # Log deduplication results
     total_original = len(pii_matches)
@@ -97,7 +198,11 @@ def deduplicate_piis(pii_matches: List[Dict[str, Any]]) -> Tuple[List[Dict[str,
         logger.info(f"🔄 Deduplicated PIIs: {total_original} → {total_unique} unique ({total_duplicates} duplicates removed from display)")
         
         # Log duplicate types
-        for (pii_type, _), count in duplicate_count.items():
+        duplicate_count = defaultdict(int)
+        for (pii_type, _), entry in seen_piis.items():
+            if entry['occurrence_count'] > 1:
+                duplicate_count[pii_type] += entry['occurrence_count'] - 1
+        for pii_type, count in duplicate_count.items():
             logger.info(f"   - {pii_type}: {count} duplicate(s) found")
     
     return display_piis, all_piis_for_masking
@@ -115,6 +220,10 @@ def filter_redundant_piis(pii_matches: List[Dict[str, Any]], confidence_threshol
         Filtered list of PIIs
     """
     
+    # Nothing below the threshold - hand the input back without copying
+    if all(pii.get('confidence', 0) >= confidence_threshold for pii in pii_matches):
+        return pii_matches
+    
     # Filter by confidence
     filtered = [
         pii for pii in pii_matches
@@ -129,6 +238,66 @@ def filter_redundant_piis(pii_matches: List[Dict[str, Any]], confidence_threshol
     return filtered
 
 
+def _keep_by_substring_index(piis_sorted: List[Dict[str, Any]], candidate_lengths: List[int]) -> List[Dict[str, Any]]:
+    """
+    Drop values contained in an earlier kept value, via a substring index
+    
+    A proper substring is always strictly shorter than its container. For
+    every candidate length L, all length-L substrings of kept values longer
+    than L are indexed, so the containment test is one dict lookup. Each
+    kept value adds up to len(value) entries per shorter length, so this is
+    only used when the group has few distinct lengths.
+    """
+    kept = []
+    substrings_by_len = defaultdict(dict)  # L -> {substring: containing pii}
+    for pii in piis_sorted:
+        normalized_value = _pii_key(pii)[1]
+        value_len = len(normalized_value)
+        
+        container = substrings_by_len[value_len].get(normalized_value)
+        if container is not None:
+            logger.debug(f"   Removed substring: {pii.get('value')} (contained in {container.get('value')})")
+            continue
+        
+        kept.append(pii)
+        for sub_len in candidate_lengths:
+            if sub_len >= value_len:
+                break
+            index = substrings_by_len[sub_len]
+            for i in range(value_len - sub_len + 1):
+                index.setdefault(normalized_value[i:i + sub_len], pii)
+    return kept
+
+
+def _keep_by_length_scan(piis_sorted: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drop values contained in an earlier kept value, via a containment scan
+    
+    Kept values are bucketed by normalized length and a candidate is only
+    tested against strictly longer ones. Memory stays linear in the group
+    size however many distinct lengths it has.
+    """
+    kept = []
+    kept_by_len = defaultdict(list)
+    for pii in piis_sorted:
+        normalized_value = _pii_key(pii)[1]
+        value_len = len(normalized_value)
+        
+        container = next(
+            (kept_pii
+             for kept_len, kept_group in kept_by_len.items() if kept_len > value_len
+             for kept_normalized, kept_pii in kept_group if normalized_value in kept_normalized),
+            None
+        )
+        if container is not None:
+            logger.debug(f"   Removed substring: {pii.get('value')} (contained in {container.get('value')})")
+            continue
+        
+        kept.append(pii)
+        kept_by_len[value_len].append((normalized_value, pii))
+    return kept
+
+
 def remove_substring_duplicates(pii_matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Remove PIIs that are substrings of other PIIs of the same type
@@ -142,17 +311,16 @@ def remove_substring_duplicates(pii_matches: List[Dict[str, Any]]) -> List[Dict[
         List with substring duplicates removed
     """
     
-    # Group by type
-    by_type = defaultdict(list)
-    for pii in pii_matches:
-        by_type[pii.get('type', 'UNKNOWN').upper()].append(pii)
+    # Group by type (sort once, then walk contiguous runs)
+    piis_sorted_by_type = sorted(pii_matches, key=_pii_type)
     
     result = []
     removed_count = 0
     
-    for pii_type, piis in by_type.items():
-        if len(piis) <= 1:
-            result.extend(piis)
+    for pii_type, group in groupby(piis_sorted_by_type, key=_pii_type):
+        piis = list(group)
+        if len(piis) == 1:
+            result.append(piis[0])
             continue
         
         # Sort by confidence (highest first) and length (longest first)
@@ -162,23 +330,12 @@ def remove_substring_duplicates(pii_matches: List[Dict[str, Any]]) -> List[Dict[
             reverse=True
         )
         
-        kept = []
-        for pii in piis_sorted:
-            normalized_value = normalize_pii_value(pii.get('value', ''), pii_type)
-            
-            # Check if this value is a substring of any already kept value
-            is_substring = False
-            for kept_pii in kept:
-                kept_normalized = normalize_pii_value(kept_pii.get('value', ''), pii_type)
-                
-                if normalized_value in kept_normalized and normalized_value != kept_normalized:
-                    is_substring = True
-                    removed_count += 1
-                    logger.debug(f"   Removed substring: {pii.get('value')} (contained in {kept_pii.get('value')})")
-                    break
-            
-            if not is_substring:
-                kept.append(pii)
+        candidate_lengths = sorted({len(_pii_key(pii)[1]) for pii in piis_sorted})
+        if len(candidate_lengths) <= SUBSTRING_INDEX_MAX_LENGTHS:
+            kept = _keep_by_substring_index(piis_sorted, candidate_lengths)
+        else:
+            kept = _keep_by_length_scan(piis_sorted)
+        removed_count += len(piis_sorted) - len(kept)
         
         result.extend(kept)
     
@@ -212,6 +369,20 @@ def smart_pii_deduplication(
     
     logger.info(f"🔍 Starting smart deduplication: {len(pii_matches)} PIIs")
     
+    # Fast paths: nothing to deduplicate
+    if not pii_matches:
+        return [], []
+    if len(pii_matches) == 1:
+        if pii_matches[0].get('confidence', 0) < confidence_threshold:
+            return [], []
+        pii_copy = pii_matches[0].copy()
+        pii_copy['occurrence_count'] = 1
+        pii_copy['is_deduplicated'] = False
+        return [pii_copy], list(pii_matches)
+    
+    # Normalize once up front; every stage below reads the cached values
+    _annotate_normalized(pii_matches)
+    
     # Step 1: Filter low-confidence
     filtered = filter_redundant_piis(pii_matches, confidence_threshold)
     
@@ -222,6 +393,10 @@ def smart_pii_deduplication(
     # Step 3: Deduplicate for display (keep all for masking)
     display_piis, masking_piis = deduplicate_piis(filtered)
     
+    # Drop the temporary keys (masking_piis shares dicts with pii_matches)
+    _strip_normalized(pii_matches)
+    _strip_normalized(display_piis)
+    
     logger.info(f"✅ Deduplication complete: {len(display_piis)} unique PIIs for display, {len(masking_piis)} for masking")
     
     return display_piis, masking_piis
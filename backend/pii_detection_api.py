@@ -3,23 +3,32 @@ PII Detection API Endpoints
 Flask blueprints for PII detection operations
 """
 
+import io
+import json
 import os
 import logging
+import threading
 import time
-from flask import Blueprint, request, jsonify, send_file
+from hashlib import blake2b
+from cachetools import LRUCache
+from flask import Blueprint, Response, request, jsonify, send_file
 from werkzeug.utils import secure_filename
-import tempfile
 from functools import lru_cache
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ========== ONLY LABEL-BASED DETECTION ==========
 # NO fallback to other detectors!
 # NO pii_detector.py, pii_detector_advanced.py, or unified_detector
 
 # Import FORMAT-SPECIFIC TEXT EXTRACTORS (NOT detectors)
 try:
-    from pii_detector_pdf import PDFPIIDetector
-    from pii_detector_txt import TXTPIIDetector
-    from pii_detector_docx import DOCXPIIDetector
+    from pii_detector_pdf import pdf_detector
+    from pii_detector_txt import txt_detector
+    from pii_detector_docx import docx_detector
     TEXT_EXTRACTORS_AVAILABLE = True
 except ImportError:
     TEXT_EXTRACTORS_AVAILABLE = False
@@ -41,7 +50,54 @@ pii_detection_bp = Blueprint('pii_detection', __name__, url_prefix='/api/pii')
 # Configuration
 ALLOWED_EXTENSIONS = {'pdf', 'txt', 'docx', 'doc'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
-UPLOAD_FOLDER = tempfile.gettempdir()
+
+# File extension -> (format name, text extractor); extractors are the
+# module-level singletons, so nothing is constructed per request
+TEXT_EXTRACTORS = {
+    '.pdf': ('PDF', pdf_detector.extract_text_from_pdf),
+    '.txt': ('TXT', txt_detector.extract_text_from_txt),
+    '.docx': ('DOCX', docx_detector.extract_text_from_docx),
+    '.doc': ('DOCX', docx_detector.extract_text_from_docx),
+} if TEXT_EXTRACTORS_AVAILABLE else {}
+
+
+# Detection results keyed by a digest of the extracted text, so re-submitted
+# documents skip the regex pass entirely
+_detection_cache = LRUCache(maxsize=256)
+_detection_cache_lock = threading.Lock()
+
+
+def detect_and_categorize_cached(text):
+    """
+    Run label-based detection + categorization, memoized on text content
+    
+    Returns:
+        tuple: (detections, categorized_by_label) - shared, treat as read-only
+    """
+    key = blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    with _detection_cache_lock:
+        cached = _detection_cache.get(key)
+    if cached is not None:
+        logger.info("⚡ Detection cache hit")
+        return cached
+    
+    result = label_based_detector.detect_and_categorize(text)
+    with _detection_cache_lock:
+        _detection_cache[key] = result
+    return result
+
+
+def ojson(payload, status=200):
+    """
+    Serialize a JSON response with orjson when available, else jsonify
+    
+    Returns:
+        tuple: (Response, status) as returned by route handlers
+    """
+    if orjson is None:
+        return jsonify(payload), status
+    return Response(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+                    mimetype='application/json'), status
 
 
 def allowed_file(filename):
@@ -64,119 +120,100 @@ def detect_file():
     try:
         # Check if file is present
         if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
+            return ojson({'error': 'No file provided'}, 400)
         
         file = request.files['file']
         
         if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+            return ojson({'error': 'No file selected'}, 400)
         
         if not allowed_file(file.filename):
-            return jsonify({'error': f'File type not allowed. Supported: PDF, TXT, DOCX'}), 400
+            return ojson({'error': f'File type not allowed. Supported: PDF, TXT, DOCX'}, 400)
         
-        # Save file temporarily
         filename = secure_filename(file.filename)
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(file_path)
-        
-        try:
-            start_time = time.time()  # Track performance
-            
-            # Get file extension
-            file_ext = os.path.splitext(filename)[1].lower()
-            
-            # CRITICAL: Validate requirements
-            if not TEXT_EXTRACTORS_AVAILABLE:
-                logger.error("❌ Text extractors not available")
-                return jsonify({'error': 'Text extraction modules not available'}), 500
-            if not LABEL_DETECTOR_AVAILABLE:
-                logger.error("❌ Label-based detector not available")
-                return jsonify({'error': 'Label-based detector not available'}), 500
-            
-            logger.info(f"🔍 Processing {file_ext} file: {filename}")
-            logger.info(f"📋 Detection method: LABEL-BASED ONLY")
-            
-            # STEP 1: Determine file type and extract text
-            extracted_text = ""
-            file_type = ""
-            
-            if file_ext == '.pdf':
-                file_type = "PDF"
-                logger.info(f"📄 PDF detected - extracting text...")
-                extracted_text = PDFPIIDetector().extract_text_from_pdf(file_path)
-                
-            elif file_ext == '.txt':
-                file_type = "TXT"
-                logger.info(f"📝 TXT detected - extracting text...")
-                extracted_text = TXTPIIDetector().extract_text_from_txt(file_path)
-                
-            elif file_ext in ['.docx', '.doc']:
-                file_type = "DOCX"
-                logger.info(f"📘 DOCX detected - extracting text...")
-                extracted_text = DOCXPIIDetector().extract_text_from_docx(file_path)
-                
-            else:
-                # Unsupported format
-                logger.warning(f"⚠️  Unsupported file format: {file_ext}")
-                return jsonify({
-                    'success': False,
-                    'error': f'Unsupported file format: {file_ext}. Only PDF, TXT, DOCX are supported.',
-                    'supported_formats': ['PDF', 'TXT', 'DOCX']
-                }), 400
-            
-            # STEP 2: Validate extracted text
-            if not extracted_text or len(extracted_text.strip()) < 2:
-                logger.warning(f"⚠️  Failed to extract text from {file_type} file")
-                return jsonify({
-                    'success': False,
-                    'error': f'Failed to extract text from {file_type} file',
-                    'file': filename,
-                    'format': file_type
-                }), 400
-            
-            logger.info(f"✓ Text extracted: {len(extracted_text)} characters")
-            
-            # STEP 3: LABEL-BASED DETECTION (ONLY METHOD)
-            logger.info(f"🎯 Starting LABEL-BASED detection (ONLY)...")
-            label_detections = label_based_detector.detect_by_labels(extracted_text)
-            logger.info(f"✓ Found {len(label_detections)} PII instances")
-            
-            # STEP 4: Categorize results
-            categorized_by_label = label_based_detector.categorize_by_label(label_detections)
-            
-            # STEP 5: Calculate metrics
-            processing_time = round(time.time() - start_time, 3)
-            
-            # STEP 6: Prepare response
-            result = {
-                'success': True,
+        # Extract straight from memory: uploads are bounded by MAX_FILE_SIZE,
+        # so there is no temp file to write, re-read and clean up
+        data = file.stream.read(MAX_FILE_SIZE + 1)
+        if len(data) > MAX_FILE_SIZE:
+            return ojson({'error': f'File too large. Maximum size: {MAX_FILE_SIZE // (1024 * 1024)}MB'}, 413)
+        
+        start_time = time.time()  # Track performance
+        
+        # Get file extension
+        file_ext = os.path.splitext(filename)[1].lower()
+        
+        # CRITICAL: Validate requirements
+        if not TEXT_EXTRACTORS_AVAILABLE:
+            logger.error("❌ Text extractors not available")
+            return ojson({'error': 'Text extraction modules not available'}, 500)
+        if not LABEL_DETECTOR_AVAILABLE:
+            logger.error("❌ Label-based detector not available")
+            return ojson({'error': 'Label-based detector not available'}, 500)
+        
+        logger.info(f"🔍 Processing {file_ext} file: {filename}")
+        logger.info(f"📋 Detection method: LABEL-BASED ONLY")
+        
+        # STEP 1: Determine file type and extract text
+        extractor = TEXT_EXTRACTORS.get(file_ext)
+        if extractor is None:
+            # Unsupported format
+            logger.warning(f"⚠️  Unsupported file format: {file_ext}")
+            return ojson({
+                'success': False,
+                'error': f'Unsupported file format: {file_ext}. Only PDF, TXT, DOCX are supported.',
+                'supported_formats': ['PDF', 'TXT', 'DOCX']
+            }, 400)
+        
+        file_type, extract_text = extractor
+        logger.info(f"📄 {file_type} detected - extracting text...")
+        extracted_text = extract_text(io.BytesIO(data))
+        
+        # STEP 2: Validate extracted text
+        if not extracted_text or len(extracted_text.strip()) < 2:
+            logger.warning(f"⚠️  Failed to extract text from {file_type} file")
+            return ojson({
+                'success': False,
+                'error': f'Failed to extract text from {file_type} file',
                 'file': filename,
-                'format': file_type,
-                'total_pii_found': len(label_detections),
-                'detections': label_detections,
-                'categorized_by_label': categorized_by_label,
-                'detection_method': 'LABEL-BASED (ONLY)',
-                'extraction_length': len(extracted_text),
-                'processing_time_ms': round(processing_time * 1000, 2),
-                'status': '✓ Detection complete'
-            }
-            
-            logger.info(f"✅ Detection complete - {len(label_detections)} PII found in {processing_time*1000:.2f}ms")
-            
-            return jsonify(result), 200
-        
-        finally:
-            # Clean up
-            if os.path.exists(file_path):
-                os.remove(file_path)
+                'format': file_type
+            }, 400)
+        
+        logger.info(f"✓ Text extracted: {len(extracted_text)} characters")
+        
+        # STEP 3: LABEL-BASED DETECTION (ONLY METHOD)
+        logger.info(f"🎯 Starting LABEL-BASED detection (ONLY)...")
+        # STEP 4: Categorize results (both memoized on the text digest)
+        label_detections, categorized_by_label = detect_and_categorize_cached(extracted_text)
+        logger.info(f"✓ Found {len(label_detections)} PII instances")
+        
+        # STEP 5: Calculate metrics
+        processing_time = round(time.time() - start_time, 3)
+        
+        # STEP 6: Prepare response
+        result = {
+            'success': True,
+            'file': filename,
+            'format': file_type,
+            'total_pii_found': len(label_detections),
+            'detections': label_detections,
+            'categorized_by_label': categorized_by_label,
+            'detection_method': 'LABEL-BASED (ONLY)',
+            'extraction_length': len(extracted_text),
+            'processing_time_ms': round(processing_time * 1000, 2),
+            'status': '✓ Detection complete'
+        }
+        
+        logger.info(f"✅ Detection complete - {len(label_detections)} PII found in {processing_time*1000:.2f}ms")
+        
+        return ojson(result, 200)
     
     except Exception as e:
         logger.error(f"❌ Error in detect_file: {e}", exc_info=True)
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e),
             'detection_method': 'LABEL-BASED'
-        }), 500
+        }, 500)
 
 
 @pii_detection_bp.route('/detect-batch', methods=['POST'])
@@ -187,7 +224,7 @@ def detect_batch():
     Returns:
         json: Batch detection results
     """
-    return jsonify({'error': 'Batch detection not implemented - use /detect-file for individual files'}), 400
+    return ojson({'error': 'Batch detection not implemented - use /detect-file for individual files'}, 400)
 
 
 @pii_detection_bp.route('/detect-directory', methods=['POST'])
@@ -198,7 +235,26 @@ def detect_directory():
     Returns:
         json: Error message
     """
-    return jsonify({'error': 'Directory scanning not supported - use /detect-file for individual files'}), 400
+    return ojson({'error': 'Directory scanning not supported - use /detect-file for individual files'}, 400)
+
+
+# /status never changes while the process runs: serialize it once and let
+# pollers revalidate against a content ETag
+_STATUS_PAYLOAD = {
+    'service': 'PII Detection API',
+    'status': 'operational',
+    'supported_formats': sorted(ALLOWED_EXTENSIONS),
+    'max_file_size_mb': MAX_FILE_SIZE // (1024 * 1024),
+    'endpoints': [
+        '/api/pii/detect-file',
+        '/api/pii/detect-batch',
+        '/api/pii/detect-directory',
+        '/api/pii/status'
+    ]
+}
+_STATUS_BODY = (orjson.dumps(_STATUS_PAYLOAD) if orjson is not None
+                else json.dumps(_STATUS_PAYLOAD).encode('utf-8'))
+_STATUS_ETAG = blake2b(_STATUS_BODY, digest_size=16).hexdigest()
 
 
 @pii_detection_bp.route('/status', methods=['GET'])
@@ -207,20 +263,12 @@ def status():
     Get PII detection API status
     
     Returns:
-        json: API status information
+        json: API status information (304 when If-None-Match matches)
     """
-    return jsonify({
-        'service': 'PII Detection API',
-        'status': 'operational',
-        'supported_formats': list(ALLOWED_EXTENSIONS),
-        'max_file_size_mb': MAX_FILE_SIZE // (1024 * 1024),
-        'endpoints': [
-            '/api/pii/detect-file',
-            '/api/pii/detect-batch',
-            '/api/pii/detect-directory',
-            '/api/pii/status'
-        ]
-    }), 200
+    response = Response(_STATUS_BODY, mimetype='application/json')
+    response.set_etag(_STATUS_ETAG)
+    response.cache_control.max_age = 60
+    return response.make_conditional(request)
 
 
 # Export blueprint
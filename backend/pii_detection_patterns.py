@@ -4,14 +4,39 @@ Comprehensive regex patterns for detecting various PII types in documents
 """
 
 import re
+from functools import cache
+from operator import itemgetter
 
-# PII Detection Patterns with labels
+try:
+    import re2  # google-re2: multi-pattern prefilter
+except ImportError:
+    re2 = None
+
+try:
+    import ahocorasick  # pyahocorasick: keyword prefilter when RE2 is missing
+except ImportError:
+    ahocorasick = None
+
+# Maximal runs of digits with single space/hyphen separators. Every match of
+# a "digit_run" pattern lies inside one run, so those patterns only have to
+# be tried on the runs found by this single scan.
+DIGIT_RUN_PATTERN = r"\b\d(?:[\s\-]?\d)*\b"
+DIGIT_RUN_MIN_LENGTH = 12
+
+# RE2's \d, \w, \s and \b are ASCII-only, and Python's str \s also matches
+# \x0b and \x1c-\x1f, which RE2's does not. Texts containing anything outside
+# this set skip the RE2 set, so it can never drop a type re would match.
+_RE2_UNSAFE_CHARS = re.compile(r'[^\x00-\x0a\x0c-\x1b\x20-\x7f]')
+
+# PII Detection Patterns with labels. "triggers" lists lowercase keywords at
+# least one of which every match contains; patterns without triggers always run.
 PII_PATTERNS = {
     # Indian Government IDs
     "Aadhaar": {
         "pattern": r"\b\d{4}\s?\d{4}\s?\d{4}\b",
         "label": "Aadhaar Number",
-        "category": "Government ID"
+        "category": "Government ID",
+        "digit_run": True
     },
     "PAN": {
         "pattern": r"\b[A-Z]{5}\d{4}[A-Z]{1}\b",
@@ -26,6 +51,7 @@ PII_PATTERNS = {
     "VoterID": {
         "pattern": r"\bEPIC/[A-Z]{3}\d{6}\b",
         "label": "Voter ID",
+        "triggers": ["epic/"],
         "category": "Government ID"
     },
     "DrivingLicense": {
@@ -38,6 +64,7 @@ PII_PATTERNS = {
     "BankAccount": {
         "pattern": r"(?:account|account\s*number|bank\s*account)[\s:]*(\d{10,18})\b",
         "label": "Bank Account Number",
+        "triggers": ["account"],
         "category": "Financial",
         "flags": re.IGNORECASE
     },
@@ -49,25 +76,29 @@ PII_PATTERNS = {
     "UPIID": {
         "pattern": r"\b[a-z0-9]+@(paytm|ybl|okaxis|okhdfcbank|okicici)\b",
         "label": "UPI ID",
+        "triggers": ["@"],
         "category": "Financial",
         "flags": re.IGNORECASE
     },
     "CreditCard": {
         "pattern": r"\b\d{4}[\s\-]?\d{4}[\s\-]?\d{4}[\s\-]?\d{4}\b",
         "label": "Credit Card Number",
-        "category": "Financial"
+        "category": "Financial",
+        "digit_run": True
     },
     
     # Contact Information
     "Phone": {
         "pattern": r"(?:phone|mobile|contact)[\s:]*(?:\+?91|0)?[\s\-]?[6-9]\d{3}[\s\-]?\d{5}\b",
         "label": "Phone Number",
+        "triggers": ["phone", "mobile", "contact"],
         "category": "Contact",
         "flags": re.IGNORECASE
     },
     "Email": {
-        "pattern": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+        "pattern": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b",
         "label": "Email Address",
+        "triggers": ["@"],
         "category": "Contact"
     },
     
@@ -75,18 +106,21 @@ PII_PATTERNS = {
     "DOB": {
         "pattern": r"(?:date\s*of\s*birth|dob|born)[\s:]*(\d{1,2}[-/]\d{1,2}[-/]\d{4})",
         "label": "Date of Birth",
+        "triggers": ["date", "dob", "born"],
         "category": "Personal",
         "flags": re.IGNORECASE
     },
     "Name": {
         "pattern": r"(?:name|full\s*name|person)[\s:]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
         "label": "Name",
+        "triggers": ["name", "person"],
         "category": "Personal",
         "flags": re.IGNORECASE
     },
     "Address": {
         "pattern": r"(?:address|location)[\s:]*([A-Za-z0-9\s,#.-]+),\s*([A-Za-z\s]+)-?\s*(\d{6})",
         "label": "Address",
+        "triggers": ["address", "location"],
         "category": "Personal",
         "flags": re.IGNORECASE
     },
@@ -95,12 +129,14 @@ PII_PATTERNS = {
     "EmployeeID": {
         "pattern": r"(?:employee\s*id|emp[\s#]*)([A-Z]{2}\d{4})\b",
         "label": "Employee ID",
+        "triggers": ["emp"],
         "category": "Employment",
         "flags": re.IGNORECASE
     },
     "StudentRoll": {
         "pattern": r"(?:roll\s*(?:number|no)|student\s*id)[\s:]*([A-Z]{3}\d{7})\b",
         "label": "Student Roll Number",
+        "triggers": ["roll", "student"],
         "category": "Education",
         "flags": re.IGNORECASE
     },
@@ -109,6 +145,7 @@ PII_PATTERNS = {
     "TransactionID": {
         "pattern": r"(?:transaction|txn|reference)[\s#:]*([A-Z]{3}\d{6})\b",
         "label": "Transaction ID",
+        "triggers": ["transaction", "txn", "reference"],
         "category": "Financial",
         "flags": re.IGNORECASE
     },
@@ -117,6 +154,7 @@ PII_PATTERNS = {
     "Salary": {
         "pattern": r"(?:salary|income|amount)[\s:]*₹?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)",
         "label": "Salary Amount",
+        "triggers": ["salary", "income", "amount"],
         "category": "Financial",
         "flags": re.IGNORECASE
     },
@@ -132,18 +170,22 @@ PII_PATTERNS = {
     "APIKey": {
         "pattern": r"(?:api[_-]?key|secret|token)[\s:]*['\"]?([a-zA-Z0-9_-]{20,})['\"]?",
         "label": "API Key",
+        "triggers": ["api", "secret", "token"],
         "category": "Credentials",
         "flags": re.IGNORECASE
     },
     "Username": {
         "pattern": r"(?:username|user)[\s:]*([a-zA-Z0-9_.-]+)",
         "label": "Username",
+        "triggers": ["user"],
         "category": "Credentials",
         "flags": re.IGNORECASE
     },
     "Password": {
-        "pattern": r"(?:password|passwd|pwd)[\s:]*['\"]?([a-zA-Z0-9!@#$%^&*()_+-=\[\]{};:'\"<>?,./]{6,})['\"]?",
+        # Letters, digits and ASCII punctuation except \ ` | ~ (!-/ and :-@ are ranges)
+        "pattern": r"(?:password|passwd|pwd)[\s:]*['\"]?([A-Za-z0-9!-/:-@\[\]^_{}]{6,})['\"]?",
         "label": "Password",
+        "triggers": ["pass", "pwd"],
         "category": "Credentials",
         "flags": re.IGNORECASE
     },
@@ -157,6 +199,7 @@ PII_PATTERNS = {
     "LinkedinProfile": {
         "pattern": r"(?:linkedin|linkedin\.com|in\.com)[\s/]*(?:in/)?([a-z0-9-]+)",
         "label": "LinkedIn Profile",
+        "triggers": ["linkedin", "in.com"],
         "category": "Social Media",
         "flags": re.IGNORECASE
     }
@@ -168,12 +211,28 @@ class PIIDetector:
     
     def __init__(self):
         self.patterns = PII_PATTERNS
-        self.compiled_patterns = self._compile_patterns()
+        self.compiled_patterns = self._get_compiled()
+        # Flat (pii_type, regex, label, category) rows for the detect loop
+        self._flat_patterns = tuple(
+            (pii_type, config['regex'], config['label'], config['category'])
+            for pii_type, config in self.compiled_patterns.items()
+        )
+        self._pattern_meta = {
+            pii_type: (label, category) for pii_type, _, label, category in self._flat_patterns
+        }
+        self.digit_run = re.compile(DIGIT_RUN_PATTERN)
+        self.digit_run_types = tuple(
+            pii_type for pii_type, config in self.patterns.items() if config.get('digit_run')
+        )
+        self.pattern_set, self.pattern_set_types, self.unfiltered_types = self._compile_pattern_set()
+        self.trigger_automaton, self.untriggered_types = self._compile_triggers()
     
-    def _compile_patterns(self):
-        """Compile all regex patterns"""
+    @classmethod
+    @cache
+    def _get_compiled(cls):
+        """Compile all regex patterns once per class; instances share them"""
         compiled = {}
-        for pii_type, config in self.patterns.items():
+        for pii_type, config in PII_PATTERNS.items():
             flags = config.get('flags', 0)
             compiled[pii_type] = {
                 'regex': re.compile(config['pattern'], flags),
@@ -182,6 +241,78 @@ class PIIDetector:
             }
         return compiled
     
+    def _compile_pattern_set(self):
+        """
+        Compile every pattern into one RE2 set so a single pass over the
+        text reports which PII types occur at all.
+        
+        Returns:
+            tuple: (re2.Set or None, set index -> pii_type, types RE2 rejected)
+        """
+        if re2 is None:
+            return None, (), frozenset()
+        
+        pattern_set = re2.Set.SearchSet()
+        set_types = []
+        unfiltered = set()
+        for pii_type, config in self.patterns.items():
+            pattern = config['pattern']
+            if config.get('flags', 0) & re.IGNORECASE:
+                pattern = '(?i)' + pattern
+            try:
+                pattern_set.Add(pattern)
+                set_types.append(pii_type)
+            except re2.error:
+                # Always run patterns RE2 can't handle
+                unfiltered.add(pii_type)
+        pattern_set.Compile()
+        return pattern_set, tuple(set_types), frozenset(unfiltered)
+    
+    def _compile_triggers(self):
+        """
+        Build an Aho-Corasick automaton over the patterns' trigger keywords,
+        the fallback prefilter when RE2 is not installed.
+        
+        Returns:
+            tuple: (ahocorasick.Automaton or None, types without triggers)
+        """
+        if ahocorasick is None:
+            return None, frozenset()
+        
+        keyword_types = {}
+        untriggered = set()
+        for pii_type, config in self.patterns.items():
+            triggers = config.get('triggers')
+            if not triggers:
+                untriggered.add(pii_type)
+                continue
+            for keyword in triggers:
+                keyword_types.setdefault(keyword, []).append(pii_type)
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, types in keyword_types.items():
+            automaton.add_word(keyword, tuple(types))
+        automaton.make_automaton()
+        return automaton, frozenset(untriggered)
+    
+    def _candidate_types(self, text):
+        """Return the PII types worth running on text, or None to scan all"""
+        if self.pattern_set is not None and not _RE2_UNSAFE_CHARS.search(text):
+            try:
+                matched = self.pattern_set.Match(text) or ()
+            except (UnicodeEncodeError, re2.error):
+                matched = None
+            if matched is not None:
+                return self.unfiltered_types.union(self.pattern_set_types[i] for i in matched)
+        
+        if self.trigger_automaton is None:
+            return None
+        # casefold so keywords line up with the patterns' IGNORECASE matching
+        triggered = set(self.untriggered_types)
+        for _, types in self.trigger_automaton.iter(text.casefold()):
+            triggered.update(types)
+        return triggered
+    
     def detect(self, text):
         """
         Detect all PII in text
@@ -189,28 +320,69 @@ class PIIDetector:
         Returns:
             list: List of detected PII with details
         """
-        detections = []
+        # Matches are collected as (start, end, pii_type, value) tuples and
+        # only turned into dicts once they are in position order
+        matches = []
+        # One RE2 pass picks the patterns worth running finditer for
+        candidate_types = self._candidate_types(text)
+        digit_run_types = self.digit_run_types
         
-        for pii_type, compiled_config in self.compiled_patterns.items():
-            regex = compiled_config['regex']
-            matches = regex.finditer(text)
-            
-            for match in matches:
-                detection = {
-                    'type': pii_type,
-                    'label': compiled_config['label'],
-                    'category': compiled_config['category'],
-                    'value': match.group(0),
-                    'start_pos': match.start(),
-                    'end_pos': match.end(),
-                    'confidence': 0.95  # High confidence for regex matches
-                }
-                detections.append(detection)
+        for pii_type, regex, _, _ in self._flat_patterns:
+            if candidate_types is not None and pii_type not in candidate_types:
+                continue
+            if pii_type in digit_run_types:
+                continue
+            matches.extend(
+                (match.start(), match.end(), pii_type, match.group(0))
+                for match in regex.finditer(text)
+            )
         
-        # Sort by position
-        detections.sort(key=lambda x: x['start_pos'])
+        digit_run_types = [
+            t for t in digit_run_types
+            if candidate_types is None or t in candidate_types
+        ]
+        if digit_run_types:
+            matches.extend(self._detect_digit_runs(text, digit_run_types))
+        
+        # Sort by position (stable, so ties keep pattern order)
+        matches.sort(key=itemgetter(0))
+        
+        pattern_meta = self._pattern_meta
+        detections = []
+        for start, end, pii_type, value in matches:
+            label, category = pattern_meta[pii_type]
+            detections.append({
+                'type': pii_type,
+                'label': label,
+                'category': category,
+                'value': value,
+                'start_pos': start,
+                'end_pos': end,
+                'confidence': 0.95  # High confidence for regex matches
+            })
         return detections
     
+    def _detect_digit_runs(self, text, pii_types):
+        """
+        Scan text once for digit runs and classify each run by the numeric
+        patterns (Aadhaar, card numbers) instead of running each over the text
+        
+        Returns:
+            list: (start, end, pii_type, value) tuples
+        """
+        matches = []
+        for run in self.digit_run.finditer(text):
+            value = run.group(0)
+            if len(value) < DIGIT_RUN_MIN_LENGTH:
+                continue
+            offset = run.start()
+            for pii_type in pii_types:
+                for match in self.compiled_patterns[pii_type]['regex'].finditer(value):
+                    matches.append(
+                        (offset + match.start(), offset + match.end(), pii_type, match.group(0))
+                    )
+        return matches
+    
     def detect_by_category(self, text, category):
         """Detect PII of specific category"""
         detections = self.detect(text)
@@ -2,10 +2,38 @@
 Ultra-Fast PII Detection System
 Optimized for maximum speed and accuracy with single-pass scanning.
 """
+import os
 import re
 import logging
-from typing import List, Dict, Any, Tuple, Optional
+import multiprocessing
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, NamedTuple, Tuple, Optional
 from functools import lru_cache
+from bisect import bisect_right
+from itertools import chain
+from operator import attrgetter
+
+import numpy as np
+
+from performance_config import perf_config
+
+try:
+    import hyperscan  # Intel Hyperscan: one-pass multi-pattern prefilter
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick  # pyahocorasick: literal-anchor prefilter
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2  # google-re2: linear-time matching for the ASCII scan patterns
+except ImportError:
+    re2 = None
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +41,10 @@ logger = logging.getLogger(__name__)
 # VALIDATION UTILITIES (Optimized)
 # ==========================================================
 
+# Checksum caches: large enough that repeated candidates across a document
+# (and across requests) always hit, but bounded for a long-running server
+_CHECKSUM_CACHE_SIZE = 65536
+
 # Pre-computed Verhoeff tables for Aadhaar validation
 _VERHOEFF_D = [
     [0,1,2,3,4,5,6,7,8,9], [1,2,3,4,0,6,7,8,9,5], [2,3,4,0,1,7,8,9,5,6],
@@ -26,32 +58,83 @@ _VERHOEFF_P = [
     [2,7,9,3,8,0,6,4,1,5], [7,0,4,6,9,1,3,2,5,8]
 ]
 
-@lru_cache(maxsize=1000)
+# D and P folded into one flat table per digit position (rightmost first),
+# indexed by c * 10 + digit, over the ASCII codes of the digits
+_VERHOEFF_STEPS = tuple(
+    tuple(_VERHOEFF_D[c][_VERHOEFF_P[i % 8][d]] for c in range(10) for d in range(10))
+    for i in range(12)
+)
+
+
+@lru_cache(maxsize=_CHECKSUM_CACHE_SIZE)
 def verhoeff_check(num: str) -> bool:
     """Fast Aadhaar validation with caching."""
-    digits = ''.join(c for c in num if c.isdigit())
+    digits = num if num.isdigit() else ''.join(c for c in num if c.isdigit())
     if len(digits) != 12:
         return False
+    if not digits.isascii():
+        digits = ''.join(str(int(d)) for d in digits)
     c = 0
-    for i, d in enumerate(reversed(digits)):
-        c = _VERHOEFF_D[c][_VERHOEFF_P[i % 8][int(d)]]
+    for step, d in zip(_VERHOEFF_STEPS, digits.encode('ascii')[::-1]):
+        c = step[c * 10 + d - 48]
     return c == 0
 
-@lru_cache(maxsize=1000)
+_VERHOEFF_D_NP = np.array(_VERHOEFF_D, dtype=np.uint8)
+_VERHOEFF_P_NP = np.array(_VERHOEFF_P, dtype=np.uint8)
+
+
+def verhoeff_check_batch(digits: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Verhoeff validation.
+    Takes an (N, 12) uint8 array of digit values, returns an (N,) bool mask.
+    """
+    digits = digits[:, ::-1]
+    c = np.zeros(len(digits), dtype=np.uint8)
+    for i in range(digits.shape[1]):
+        c = _VERHOEFF_D_NP[c, _VERHOEFF_P_NP[i % 8, digits[:, i]]]
+    return c == 0
+
+
+def aadhaar_digit_matrix(values: List[str]) -> np.ndarray:
+    """Pack 12-digit strings into an (N, 12) uint8 array for verhoeff_check_batch."""
+    joined = ''.join(values)
+    if not joined.isascii():
+        # Non-ASCII decimal digits (Devanagari etc.) pack as their ASCII values
+        joined = ''.join(str(int(d)) for d in joined)
+    buf = joined.encode('ascii')
+    return (np.frombuffer(buf, dtype=np.uint8) - ord('0')).reshape(-1, 12)
+
+# SWAR Luhn: digits are packed one per nibble (parsing the digit string as hex
+# gives exactly that), so all 16 digits of a word are summed without branching
+_NIBBLES = 0x0F0F0F0F0F0F0F0F
+_SIXES = 0x0606060606060606
+_ONES = 0x0101010101010101
+
+
+def _luhn_word_sum(word: int) -> int:
+    """Luhn digit sum of up to 16 packed digits, rightmost digit in nibble 0."""
+    even = word & _NIBBLES
+    doubled = ((word >> 4) & _NIBBLES) << 1
+    # Subtract 9 from every byte above 9 (d + 6 carries into bit 4 iff d > 9)
+    doubled -= ((doubled + _SIXES) >> 4 & _ONES) * 9
+    return ((even + doubled) * _ONES >> 56) & 0xFF
+
+
+@lru_cache(maxsize=_CHECKSUM_CACHE_SIZE)
 def luhn_check(num: str) -> bool:
     """Fast Luhn checksum validation with caching."""
-    digits = [int(c) for c in num if c.isdigit()]
+    # Callers in the scan path pass bare digits: skip the per-character filter
+    digits = num if num.isdigit() else ''.join(c for c in num if c.isdigit())
     if len(digits) < 14:
         return False
-    checksum = 0
-    parity = len(digits) % 2
-    for i, d in enumerate(digits):
-        if i % 2 == parity:
-            d *= 2
-            if d > 9:
-                d -= 9
-        checksum += d
-    return checksum % 10 == 0
+    if len(digits) == 16:
+        # Card numbers: one packed word covers every digit
+        return _luhn_word_sum(int(digits, 16)) % 10 == 0
+    # Low word takes the rightmost 16 digits; 16 is even, so the high word
+    # keeps the same doubling positions
+    low = int(digits[-16:], 16)
+    high = int(digits[:-16], 16) if len(digits) > 16 else 0
+    return (_luhn_word_sum(low) + _luhn_word_sum(high)) % 10 == 0
 
 # ==========================================================
 # OPTIMIZED REGEX PATTERNS (Single-pass, efficient)
@@ -106,8 +189,8 @@ PATTERNS = {
     "project_code": re.compile(r'\b(PRJ\d{4})\b'),
     "referral_code": re.compile(r'\b([A-Z0-9]{6})\b'),
     "license_key": re.compile(r'\b([A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4})\b'),
-    "device_id": re.compile(r'\b([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\b', re.IGNORECASE),
-    "session_token": re.compile(r'\b([0-9a-f]{32})\b', re.IGNORECASE),
+    "device_id": re.compile(r'\b([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})\b'),
+    "session_token": re.compile(r'\b([0-9a-fA-F]{32})\b'),
     "salary": re.compile(r'\b(₹\d{1,3}(?:,\d{2,3})*)\b'),
     "gps": re.compile(r'\b((?:[6-9]|[12][0-9]|3[0-7])\.[0-9]{1,6},(?:[6-8][0-9]|9[0-7])\.[0-9]{1,6})\b'),
     
@@ -118,8 +201,94 @@ PATTERNS = {
     "social_handle": re.compile(r'@\b([A-Za-z0-9._]{1,50})\b'),
 }
 
-# Pre-compiled whitespace removal
-_WHITESPACE_PATTERN = re.compile(r'\s+')
+# Structured "<PREFIX><digits>" IDs, scanned as one alternation and told
+# apart by the named group that matched. Every match is a whole word with a
+# distinct prefix, so no two alternatives can match overlapping text and the
+# fused scan finds exactly what the separate scans would.
+_FUSED_TYPES = (
+    "employee_id", "student_roll", "transaction_id", "customer_id", "order_id",
+    "medical_record_id", "insurance_policy_no", "tax_record", "membership_id",
+    "project_code",
+)
+_FUSED_PATTERN = re.compile(
+    "|".join(f"(?P<{pii_type}>{PATTERNS[pii_type].pattern})" for pii_type in _FUSED_TYPES)
+)
+
+# Opt-in RE2 for the ASCII patterns: matching is linear-time, so crafted
+# input can't make a scan backtrack, but its Python binding runs typical
+# text about 1.5x slower than re
+USE_RE2 = re2 is not None and os.environ.get('PII_USE_RE2', 'false').lower() == 'true'
+
+
+def _compile_ascii(pattern: str, flags: int = 0):
+    """Compile with re.ASCII, or with RE2 if enabled and it supports the pattern."""
+    if USE_RE2:
+        options = re2.Options()
+        options.case_sensitive = not flags & re.IGNORECASE
+        options.log_errors = False
+        try:
+            return re2.compile(pattern, options)
+        except re2.error:
+            pass  # lookarounds (upi) stay on re
+    return re.compile(pattern, (flags & ~re.UNICODE) | re.ASCII)
+
+
+# ASCII copies for plain ASCII text (see _ASCII_UNSAFE_CHARS): there \b, \d,
+# \w, \s and IGNORECASE mean the same as in Unicode mode, but character
+# classes skip the Unicode tables and finditer runs about twice as fast
+ASCII_PATTERNS = {
+    pii_type: _compile_ascii(pattern.pattern, pattern.flags)
+    for pii_type, pattern in PATTERNS.items()
+}
+_FUSED_PATTERN_ASCII = _compile_ascii(_FUSED_PATTERN.pattern)
+
+# scan_text memoization: short texts (form fields, CSV cells) repeat a lot.
+# One cache serves every thread's detector, bounded by the total length of
+# the cached texts rather than the entry count
+_SCAN_CACHE_MAX_CHARS = 1 << 20
+_SCAN_CACHE_MAX_TEXT = 4096
+
+# scan_text_parallel: below this size a pool round trip costs more than it saves
+_PARALLEL_MIN_TEXT = 16384
+_PARALLEL_CHUNK = 8192
+_PARALLEL_OVERLAP = 1024
+_scan_pool = None
+_scan_pool_lock = threading.Lock()
+
+# detect_pii_batch joins texts with this. No pattern can match a NUL (it is
+# neither \w nor \s), and the run is longer than the 20-character dedupe
+# window, so texts cannot affect each other's results
+_BATCH_SEPARATOR = '\x00' * 32
+
+# Digit extraction for matched numbers: the numeric patterns only match \d,
+# '-' and whitespace, so deleting ASCII non-digits keeps exactly the digits
+_NON_DIGIT_ASCII = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isdigit()))
+
+# Token-like types whose patterns accept any long word (api_key) or any
+# six-character caps word (referral_code): a value must mix letters and
+# digits, which drops plain words like "responsibilities" or "SHARMA"
+_MIXED_TOKEN_TYPES = frozenset({"api_key", "referral_code"})
+_HAS_DIGIT = re.compile(r'[0-9]')
+_HAS_LETTER = re.compile(r'[A-Za-z]')
+
+
+def is_mixed_token(value: str) -> bool:
+    """True if value contains both an ASCII letter and an ASCII digit."""
+    return bool(_HAS_DIGIT.search(value) and _HAS_LETTER.search(value))
+
+
+# False-positive filters in the scan loop
+_PHONE_ANCHORED = re.compile(r'\A[6-9]\d{9}\Z')
+_PAN_ANCHORED = re.compile(r'\A[A-Z]{5}\d{4}[A-Z]\Z')
+_COMMON_WORDS = frozenset({'my', 'is', 'id', 'no', 'pan', 'email', 'phone', 'upi', 'ifsc', 'aadhaar'})
+
+# A UPI handle on a public mail domain is really an email address. The old
+# gmail.com/yahoo.in/... list is covered by the '.com' / '.in' substring test
+_UPI_PUBLIC_DOMAIN = re.compile(r'\.(?:com|in)')
+
+
+# Sort key for PIIHits
+_BY_START = attrgetter('start')
 
 # Confidence mapping (pre-computed for speed)
 _CONFIDENCE_MAP = {
@@ -150,6 +319,197 @@ _PRIORITY_ORDER = [
     "email_domain", "social_handle",
 ]
 
+# Scan loop rows: (type, result type, base confidence) in priority order.
+# The fused group runs as one row in its first type's slot; its matches
+# look their row up in _SCAN_ROWS by group name
+_SCAN_ROWS = {t: (t, sys.intern(t.upper()), _CONFIDENCE_MAP.get(t, 0.5)) for t in _PRIORITY_ORDER if t in PATTERNS}
+_SCAN_ORDER = tuple(row for t, row in _SCAN_ROWS.items() if t not in _FUSED_TYPES[1:])
+
+
+# Literals every match of a pattern must contain (any one of them). Patterns
+# not listed have no such literal and always run.
+_LITERAL_ANCHORS = {
+    "employee_id": ("EMP",), "student_roll": ("SR202",), "transaction_id": ("TXN",),
+    "customer_id": ("CUST",), "order_id": ("ORD",), "medical_record_id": ("MR",),
+    "insurance_policy_no": ("IP",), "tax_record": ("TAX",), "membership_id": ("MID",),
+    "project_code": ("PRJ",), "cin": ("PTC",), "gstin": ("Z",), "ifsc": ("0",),
+    "upi": ("@",), "email": ("@",), "email_domain": ("@",), "social_handle": ("@",),
+    "license_key": ("-",), "device_id": ("-",), "salary": ("₹",), "gps": (",",),
+    "ipv4": (".",), "ipv6": (":",), "mac": (":", "-"),
+}
+
+
+def _compile_anchors():
+    """
+    Split _LITERAL_ANCHORS into single characters (tested with str `in`) and
+    longer literals (one Aho-Corasick pass, or `in` without pyahocorasick).
+    
+    Returns:
+        tuple: (char -> types, literal -> types, Automaton or None, anchored types)
+    """
+    char_types = {}
+    word_types = {}
+    for pii_type, literals in _LITERAL_ANCHORS.items():
+        for literal in literals:
+            target = char_types if len(literal) == 1 else word_types
+            target.setdefault(literal, []).append(pii_type)
+    
+    automaton = None
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for literal, types in word_types.items():
+            automaton.add_word(literal, tuple(types))
+        automaton.make_automaton()
+    return ({c: tuple(t) for c, t in char_types.items()},
+            {w: tuple(t) for w, t in word_types.items()},
+            automaton, frozenset(_LITERAL_ANCHORS))
+
+
+_ANCHOR_CHARS, _ANCHOR_WORDS, _ANCHOR_AUTOMATON, _ANCHORED_TYPES = _compile_anchors()
+
+# Hyperscan's and re.ASCII's \d, \w, \s and \b are ASCII-only, and Python's
+# str \s also matches \x1c-\x1f. Texts containing anything outside this set
+# skip the prefilter and the ASCII_PATTERNS, so neither can change a match.
+_ASCII_UNSAFE_CHARS = re.compile(r'[^\x00-\x1b\x20-\x7f]')
+
+
+@lru_cache(maxsize=1)
+def _compile_prefilter():
+    """
+    Compile every PATTERNS entry into one Hyperscan block database (prefilter
+    mode, one report per pattern) to find which PII types occur in one pass.
+    Built once per process and shared by all detectors.
+    
+    Returns:
+        tuple: (hyperscan.Database or None, id -> pii_type, types Hyperscan rejected)
+    """
+    if hyperscan is None:
+        return None, (), frozenset()
+    
+    base_flags = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH
+    entries = [
+        (pii_type, pattern.pattern.encode('utf-8'),
+         base_flags | (hyperscan.HS_FLAG_CASELESS if pattern.flags & re.IGNORECASE else 0))
+        for pii_type, pattern in PATTERNS.items()
+    ]
+    
+    def build(entries):
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        database.compile(expressions=[e[1] for e in entries], ids=list(range(len(entries))),
+                         elements=len(entries), flags=[e[2] for e in entries])
+        return database
+    
+    unfiltered = set()
+    try:
+        database = build(entries)
+    except hyperscan.error:
+        # Find the patterns Hyperscan can't handle; those always run
+        accepted = []
+        for entry in entries:
+            try:
+                build([entry])
+                accepted.append(entry)
+            except hyperscan.error:
+                unfiltered.add(entry[0])
+        entries = accepted
+        database = build(entries) if entries else None
+    return database, tuple(e[0] for e in entries), frozenset(unfiltered)
+
+
+def _get_scan_pool() -> ProcessPoolExecutor:
+    """
+    Shared worker pool for scan_text_parallel, created on first use.
+    
+    Under gunicorn's gthread workers (gunicorn_config.py) the calling
+    process has other request threads running, so its children are started
+    from a forkserver (spawn where that is unavailable) rather than forked
+    mid-request with those threads' locks held. Every gunicorn worker owns
+    its own pool, so MAX_SCAN_WORKERS multiplies by GUNICORN_WORKERS; keep
+    their product near the CPU count.
+    """
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _scan_pool = ProcessPoolExecutor(max_workers=perf_config.MAX_SCAN_WORKERS,
+                                             mp_context=multiprocessing.get_context(method))
+        return _scan_pool
+
+
+class _ScanCache:
+    """Thread-safe LRU of scan results, evicting once its keys exceed max_chars."""
+    
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+    
+    def get(self, text: str):
+        """Cached hits for text, or None."""
+        with self._lock:
+            hits = self._entries.get(text)
+            if hits is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(text)
+                self.hits += 1
+            return hits
+    
+    def put(self, text: str, hits: Tuple) -> None:
+        """Store hits for text, dropping least recently used entries over budget."""
+        with self._lock:
+            if text in self._entries:
+                return
+            self._entries[text] = hits
+            self._chars += len(text)
+            while self._chars > self.max_chars:
+                evicted, _ = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+    
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._chars = self.hits = self.misses = 0
+
+
+_scan_cache = _ScanCache(_SCAN_CACHE_MAX_CHARS)
+
+
+class PIIHit(NamedTuple):
+    """One detection, as kept internally; turned into a dict at the API boundary."""
+    type: str
+    match: str
+    normalized: str
+    confidence: float
+    start: int
+    end: int
+    context: bool = False
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """scan_text result dict."""
+        return {
+            "type": self.type,
+            "match": self.match,
+            "normalized": self.normalized,
+            "confidence": self.confidence,
+            "start": self.start,
+            "end": self.end
+        }
+
+
+def _scan_chunk(job: Tuple[str, int, int]) -> List[PIIHit]:
+    """
+    Pool worker: collect one slice's matches that start in [lo, hi).
+    Dedupe is left to the caller: its 20-character window chains across
+    neighbouring matches, so it must see the merged matches in one pass.
+    """
+    text, lo, hi = job
+    return [hit for hit in get_detector()._collect_text(text) if lo <= hit.start < hi]
+
 
 class PIIDetector:
     """Ultra-fast PII Detector with single-pass scanning."""
@@ -157,11 +517,47 @@ class PIIDetector:
     def __init__(self):
         """Initialize detector with pre-compiled patterns."""
         self.patterns = PATTERNS
+        self.ascii_patterns = ASCII_PATTERNS
+        self.prefilter, self.prefilter_types, self.unfiltered_types = _compile_prefilter()
+        # Hyperscan scratch space is not thread-safe: one per thread
+        self._scratch = threading.local()
         logger.info(f"PII Detector initialized with {len(PATTERNS)} patterns")
     
+    def _candidate_types(self, text: str, ascii_safe: bool):
+        """Return the PII types whose pattern may occur in text, or None to scan all."""
+        if self.prefilter is None or not ascii_safe:
+            return self._anchored_candidates(text)
+        
+        scratch = getattr(self._scratch, 'scratch', None)
+        if scratch is None:
+            scratch = self._scratch.scratch = hyperscan.Scratch(self.prefilter)
+        
+        hits = set()
+        def on_match(pattern_id, start, end, flags, context):
+            hits.add(pattern_id)
+        
+        self.prefilter.scan(text.encode('ascii'), match_event_handler=on_match, scratch=scratch)
+        return self.unfiltered_types.union(self.prefilter_types[i] for i in hits)
+    
+    def _anchored_candidates(self, text: str):
+        """Fallback prefilter: drop anchored patterns whose literals are absent."""
+        present = set(self.patterns.keys() - _ANCHORED_TYPES)
+        for char, types in _ANCHOR_CHARS.items():
+            if char in text:
+                present.update(types)
+        if _ANCHOR_AUTOMATON is not None:
+            for _, types in _ANCHOR_AUTOMATON.iter(text):
+                present.update(types)
+        else:
+            for word, types in _ANCHOR_WORDS.items():
+                if word in text:
+                    present.update(types)
+        return present
+    
     def _normalize(self, text: str) -> str:
         """Fast normalization - remove whitespace."""
-        return _WHITESPACE_PATTERN.sub('', text)
+        # str.split() splits on exactly the characters re's \s matches
+        return ''.join(text.split())
     
     def _calculate_confidence(self, pii_type: str, value: str, normalized: str) -> float:
         """Fast confidence calculation with validation."""
@@ -169,21 +565,21 @@ class PIIDetector:
         
         # Validation-based confidence boost
         if pii_type == "aadhaar":
-            digits = ''.join(c for c in normalized if c.isdigit())
+            digits = normalized.translate(_NON_DIGIT_ASCII)
             if len(digits) == 12:
                 if verhoeff_check(digits):
                     return 0.95
                 return 0.7
         
         elif pii_type == "card_number":
-            digits = ''.join(c for c in normalized if c.isdigit())
+            digits = normalized.translate(_NON_DIGIT_ASCII)
             if len(digits) >= 15:
                 if luhn_check(digits):
                     return 0.9
                 return 0.6
         
         elif pii_type == "imei":
-            digits = ''.join(c for c in normalized if c.isdigit())
+            digits = normalized.translate(_NON_DIGIT_ASCII)
             if len(digits) >= 14:
                 if luhn_check(digits):
                     return 0.85
@@ -192,8 +588,7 @@ class PIIDetector:
         elif pii_type == "upi":
             if '@' in value:
                 domain = value.split('@')[1].lower()
-                email_domains = {'gmail.com', 'yahoo.com', 'yahoo.in', 'outlook.com', 'hotmail.com'}
-                if any(ed in domain for ed in email_domains) or '.com' in domain or '.in' in domain:
+                if _UPI_PUBLIC_DOMAIN.search(domain):
                     return 0.2
                 return 0.85
         
@@ -203,26 +598,105 @@ class PIIDetector:
         """
         Ultra-fast single-pass PII detection.
         Returns list of dicts: {type, match, normalized, confidence, start, end}
+        Results for short texts are memoized; callers get fresh dicts.
         """
+        return [hit.as_dict() for hit in self._scan_hits(text)]
+    
+    def _scan_hits(self, text: str) -> Tuple[PIIHit, ...]:
+        """scan_text as PIIHits, through the cache for short texts."""
         if not text or len(text.strip()) < 2:
-            return []
+            return ()
+        if len(text) > _SCAN_CACHE_MAX_TEXT:
+            return self._scan_text_impl(text)
+        hits = _scan_cache.get(text)
+        if hits is None:
+            hits = tuple(self._scan_text_impl(text))
+            _scan_cache.put(text, hits)
+        return hits
+    
+    def scan_text_parallel(self, text: str, chunk: int = _PARALLEL_CHUNK,
+                           overlap: int = _PARALLEL_OVERLAP) -> List[Dict[str, Any]]:
+        """
+        scan_text for large documents, split across a process pool.
+        Each chunk is scanned with `overlap` characters of context on both
+        sides, so matches crossing a cut are found whole and see the same
+        neighbours as in a full scan. A chunk keeps only the matches that
+        start inside it; dedupe and validation then run once over the
+        merged matches.
+        """
+        return [hit.as_dict() for hit in self._scan_hits_parallel(text, chunk, overlap)]
+    
+    def _scan_hits_parallel(self, text: str, chunk: int = _PARALLEL_CHUNK,
+                            overlap: int = _PARALLEL_OVERLAP) -> List[PIIHit]:
+        """scan_text_parallel as PIIHits."""
+        if len(text) < _PARALLEL_MIN_TEXT:
+            return list(self._scan_hits(text))
         
+        origins = []
+        jobs = []
+        for base in range(0, len(text), chunk):
+            origin = max(0, base - overlap)
+            origins.append(origin)
+            jobs.append((text[origin:base + chunk + overlap], base - origin, base - origin + chunk))
+        
+        hits = []
+        for origin, chunk_hits in zip(origins, _get_scan_pool().map(_scan_chunk, jobs)):
+            hits.extend(hit._replace(start=hit.start + origin, end=hit.end + origin)
+                        for hit in chunk_hits)
+        return self._finish_hits(hits)
+    
+    def clear_cache(self):
+        """Drop memoized scan_text results (the cache is shared by all detectors)."""
+        _scan_cache.clear()
+    
+    def _scan_text_impl(self, text: str) -> List[PIIHit]:
+        """Uncached scan behind scan_text."""
+        return self._finish_hits(self._collect_text(text))
+    
+    def _collect_text(self, text: str) -> List[PIIHit]:
+        """_scan_text_impl's matches before dedupe, at base confidence."""
+        # One Hyperscan pass picks the patterns worth running finditer for
+        ascii_safe = not _ASCII_UNSAFE_CHARS.search(text)
+        return self._collect_hits(text, ascii_safe, self._candidate_types(text, ascii_safe))
+    
+    def _scan_candidates(self, text: str, ascii_safe: bool, candidate_types) -> List[PIIHit]:
+        """Run the candidate_types patterns (all if None) over text."""
+        return self._finish_hits(self._collect_hits(text, ascii_safe, candidate_types))
+    
+    def _collect_hits(self, text: str, ascii_safe: bool, candidate_types) -> List[PIIHit]:
+        """Filtered pattern matches in priority order, not yet deduplicated."""
         results = []
-        seen_positions = {}  # (start, end) -> (type, normalized, confidence)
+        seen_positions = {}  # (start, end) -> (type, normalized, value)
+        if ascii_safe:
+            patterns, fused_pattern = self.ascii_patterns, _FUSED_PATTERN_ASCII
+        else:
+            patterns, fused_pattern = self.patterns, _FUSED_PATTERN
         
         # Single pass through all patterns
-        for pii_type in _PRIORITY_ORDER:
-            if pii_type not in self.patterns:
-                continue
-            
-            pattern = self.patterns[pii_type]
+        for pii_type, type_upper, base_conf in _SCAN_ORDER:
+            fused = pii_type == _FUSED_TYPES[0]
+            if fused:
+                # One pass covers the whole group, in the first one's slot
+                # (the group is contiguous in _PRIORITY_ORDER)
+                if candidate_types is not None and candidate_types.isdisjoint(_FUSED_TYPES):
+                    continue
+                matches = fused_pattern.finditer(text)
+            else:
+                if candidate_types is not None and pii_type not in candidate_types:
+                    continue
+                matches = patterns[pii_type].finditer(text)
+            mixed_only = pii_type in _MIXED_TOKEN_TYPES
             
-            for match in pattern.finditer(text):
+            for match in matches:
+                if fused:
+                    pii_type, type_upper, base_conf = _SCAN_ROWS[match.lastgroup]
                 start_pos = match.start()
                 end_pos = match.end()
                 
                 # Extract value
                 val = match.group(1) if match.groups() and match.group(1) else match.group(0)
+                if mixed_only and not is_mixed_token(val):
+                    continue
                 val_stripped = val.strip()
                 
                 # Skip if too short
@@ -233,21 +707,19 @@ class PIIDetector:
                 norm = self._normalize(val)
                 norm_lower = norm.lower()
                 
-                # Calculate confidence first
-                conf = self._calculate_confidence(pii_type, val, norm)
-                
                 # Check for duplicates at same position
                 pos_key = (start_pos, end_pos)
                 if pos_key in seen_positions:
-                    existing_type, existing_norm, existing_conf = seen_positions[pos_key]
+                    existing_type, existing_norm, existing_val = seen_positions[pos_key]
                     # Skip if same normalized value (cross-type duplicate)
                     if existing_norm.lower() == norm_lower:
                         continue
                     # If different types at same position, keep higher confidence
-                    if conf <= existing_conf:
+                    conf = self._calculate_confidence(pii_type, val, norm)
+                    if conf <= self._calculate_confidence(existing_type, existing_val, existing_norm):
                         continue
                     # Remove existing lower-confidence match
-                    results = [r for r in results if not (r['start'] == start_pos and r['end'] == end_pos)]
+                    results = [r for r in results if not (r.start == start_pos and r.end == end_pos)]
                 
                 # Filter false positives
                 # Skip if it's a common word (too short or common patterns)
@@ -270,7 +742,7 @@ class PIIDetector:
                 # Skip voter_id matches that are actually phone numbers or transaction IDs
                 if pii_type == "voter_id":
                     # If it matches phone pattern, skip
-                    if re.match(r'^[6-9]\d{9}$', val_stripped):
+                    if _PHONE_ANCHORED.match(val_stripped):
                         continue
                     # If it matches transaction ID pattern, skip
                     if val_stripped.startswith('TXN') and len(val_stripped) == 11:
@@ -281,44 +753,52 @@ class PIIDetector:
                 
                 # Skip bank_account matches that are phone numbers (10 digits starting with 6-9)
                 if pii_type == "bank_account":
-                    if re.match(r'^[6-9]\d{9}$', val_stripped):
+                    if _PHONE_ANCHORED.match(val_stripped):
                         continue
                 
                 # Skip common words that match patterns
-                common_words = {'my', 'is', 'id', 'no', 'pan', 'email', 'phone', 'upi', 'ifsc', 'aadhaar'}
-                if val_stripped.lower() in common_words:
+                if val_stripped.lower() in _COMMON_WORDS:
                     continue
                 
                 # Store result
-                result = {
-                    "type": pii_type.upper(),
-                    "match": val,
-                    "normalized": norm,
-                    "confidence": round(conf, 2),
-                    "start": start_pos,
-                    "end": end_pos
-                }
-                
-                results.append(result)
-                seen_positions[pos_key] = (pii_type, norm, conf)
+                results.append(PIIHit(type_upper, val, norm, base_conf, start_pos, end_pos))
+                seen_positions[pos_key] = (pii_type, norm, val)
         
-        # Fast deduplication: remove same type + normalized at nearby positions
-        return self._deduplicate_fast(results)
+        return results
     
-    def _deduplicate_fast(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _finish_hits(self, results: List[PIIHit]) -> List[PIIHit]:
+        """Deduplicate collected matches, validate the survivors and sort."""
+        # Fast deduplication: remove same type + normalized at nearby positions.
+        # Results sharing a dedupe key have the same validated confidence, so
+        # deduplicating on base confidence keeps the same survivors and the
+        # Verhoeff/Luhn checks only run for those.
+        survivors = {id(r) for r in self._deduplicate_fast(results)}
+        unique = [
+            PIIHit(r.type, r.match, r.normalized,
+                   round(self._calculate_confidence(r.type.lower(), r.match, r.normalized), 2),
+                   r.start, r.end)
+            for r in results if id(r) in survivors
+        ]
+        unique.sort(key=lambda x: (x.start, -x.confidence))
+        return unique
+    
+    def _deduplicate_fast(self, results: List[PIIHit]) -> List[PIIHit]:
         """Fast O(n) deduplication."""
         if not results:
             return []
         
-        # Sort by confidence (desc) then position
-        results.sort(key=lambda x: (-x['confidence'], x['start']))
+        # Visit by confidence (desc) then position: sort once by position, then
+        # bucket by confidence - there are only a handful of distinct values
+        buckets = {}
+        for result in sorted(results, key=_BY_START):
+            buckets.setdefault(result.confidence, []).append(result)
         
         unique = []
         seen = {}  # (type, normalized) -> last position
         
-        for result in results:
-            key = (result['type'], result['normalized'].lower())
-            start, end = result['start'], result['end']
+        for result in chain.from_iterable(buckets[conf] for conf in sorted(buckets, reverse=True)):
+            key = (result.type, result.normalized.lower())
+            start, end = result.start, result.end
             
             if key in seen:
                 last_start, last_end = seen[key]
@@ -333,7 +813,7 @@ class PIIDetector:
             seen[key] = (start, end)
         
         # Sort by position for final output
-        unique.sort(key=lambda x: x['start'])
+        unique.sort(key=_BY_START)
         return unique
     
     def detect_pii(self, text: str, page_num: int = 0, bbox: Optional[Tuple[int, int, int, int]] = None) -> List[Dict[str, Any]]:
@@ -341,36 +821,82 @@ class PIIDetector:
         Main detection interface.
         Returns list of PII detections compatible with existing codebase.
         """
-        scan_results = self.scan_text(text)
+        return [self._detection(hit, page_num, bbox) for hit in self._scan_hits(text)]
+    
+    def detect_pii_batch(self, texts: List[str], page_num: int = 0) -> List[List[Dict[str, Any]]]:
+        """
+        detect_pii for many small texts (CSV cells, PDF spans) in one scan.
+        Distinct texts are joined with _BATCH_SEPARATOR and scanned once, so the
+        per-call pattern setup, prefilter and dedupe are paid once per batch.
+        Plain ASCII texts are joined apart from the rest so that one non-ASCII
+        cell doesn't take the whole batch off the fast ASCII patterns.
+        Returns one detect_pii result list per input text.
+        """
+        groups = {}  # (ascii_safe, candidate types) -> {distinct text: offset in joined text}
+        ends = {}
+        for text in dict.fromkeys(texts):
+            if not text or len(text.strip()) < 2:
+                continue
+            safe = _ASCII_UNSAFE_CHARS.search(text) is None
+            candidates = self._candidate_types(text, safe)
+            key = (safe, frozenset(candidates) if candidates is not None else None)
+            end = ends.get(key, 0)
+            groups.setdefault(key, {})[text] = end
+            ends[key] = end + len(text) + len(_BATCH_SEPARATOR)
         
-        # Convert to expected format
-        results = []
-        for item in scan_results:
-            result = {
-                'type': item['type'],
-                'value': item['match'],
-                'normalized': item.get('normalized', item['match']),
-                'start': item.get('start', 0),
-                'end': item.get('end', 0),
-                'page': page_num,
-                'confidence': item.get('confidence', 0.8)
-            }
-            
-            if bbox:
-                result['bbox'] = bbox
-            
-            results.append(result)
+        hits_at = {}  # text -> (offset, hits)
+        for (safe, candidates), group in groups.items():
+            bases = list(group.values())
+            group_hits = [[] for _ in bases]
+            for hit in self._scan_candidates(_BATCH_SEPARATOR.join(group), safe, candidates):
+                group_hits[bisect_right(bases, hit.start) - 1].append(hit)
+            for (text, base), hits in zip(group.items(), group_hits):
+                hits_at[text] = (base, hits)
         
+        results = []
+        for text in texts:
+            base, hits = hits_at.get(text, (0, ()))
+            results.append([self._detection(hit, page_num, None, base) for hit in hits])
         return results
     
+    @staticmethod
+    def _detection(hit: PIIHit, page_num: int, bbox: Optional[Tuple[int, int, int, int]],
+                   offset: int = 0) -> Dict[str, Any]:
+        """Convert a PIIHit to the detect_pii format, offsets relative to offset."""
+        result = {
+            'type': hit.type,
+            'value': hit.match,
+            'normalized': hit.normalized,
+            'start': hit.start - offset,
+            'end': hit.end - offset,
+            'page': page_num,
+            'confidence': hit.confidence
+        }
+        
+        if bbox:
+            result['bbox'] = bbox
+        
+        return result
+    
     def validate_aadhaar(self, aadhaar: str) -> bool:
         """Validate Aadhaar using Verhoeff algorithm."""
         return verhoeff_check(aadhaar)
     
     def validate_pan(self, pan: str) -> bool:
         """Validate PAN format."""
-        return bool(re.match(r'^[A-Z]{5}\d{4}[A-Z]$', pan.strip()))
+        return bool(_PAN_ANCHORED.match(pan.strip()))
 
 
 # Global instance
 pii_detector = PIIDetector()
+
+# One detector per worker thread, so concurrent scans share no mutable state
+_detector_tls = threading.local()
+
+
+def get_detector() -> PIIDetector:
+    """Get the calling thread's PIIDetector, creating it on first use."""
+    detector = getattr(_detector_tls, 'detector', None)
+    if detector is None:
+        detector = _detector_tls.detector = PIIDetector()
+    return detector
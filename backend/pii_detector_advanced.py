@@ -5,11 +5,14 @@ Optimized context-aware detection with maximum speed.
 import re
 import logging
 import time
+import threading
+from bisect import bisect_left
 from typing import List, Dict, Any, Tuple, Optional
 from functools import lru_cache
 
 from pii_detector import (
-    verhoeff_check, luhn_check, PATTERNS,
+    verhoeff_check, luhn_check, is_mixed_token, PATTERNS, PIIHit,
+    _ASCII_UNSAFE_CHARS, _MIXED_TOKEN_TYPES,
     PIIDetector as BasePIIDetector
 )
 
@@ -59,27 +62,29 @@ class ContextAwarePIIDetector:
     
     def _calculate_confidence_fast(self, pii_type: str, value: str, normalized: str) -> float:
         """Fast confidence calculation."""
-        from pii_detector import _CONFIDENCE_MAP, verhoeff_check, luhn_check
+        from pii_detector import (
+            _CONFIDENCE_MAP, _NON_DIGIT_ASCII, _UPI_PUBLIC_DOMAIN, verhoeff_check, luhn_check
+        )
         
         base_conf = _CONFIDENCE_MAP.get(pii_type, 0.5)
         
         # Validation-based confidence boost
         if pii_type == "aadhaar":
-            digits = ''.join(c for c in normalized if c.isdigit())
+            digits = normalized.translate(_NON_DIGIT_ASCII)
             if len(digits) == 12:
                 if verhoeff_check(digits):
                     return 0.95
                 return 0.7
         
         elif pii_type == "card_number":
-            digits = ''.join(c for c in normalized if c.isdigit())
+            digits = normalized.translate(_NON_DIGIT_ASCII)
             if len(digits) >= 15:
                 if luhn_check(digits):
                     return 0.9
                 return 0.6
         
         elif pii_type == "imei":
-            digits = ''.join(c for c in normalized if c.isdigit())
+            digits = normalized.translate(_NON_DIGIT_ASCII)
             if len(digits) >= 14:
                 if luhn_check(digits):
                     return 0.85
@@ -88,44 +93,63 @@ class ContextAwarePIIDetector:
         elif pii_type == "upi":
             if '@' in value:
                 domain = value.split('@')[1].lower()
-                email_domains = {'gmail.com', 'yahoo.com', 'yahoo.in', 'outlook.com', 'hotmail.com'}
-                if any(ed in domain for ed in email_domains) or '.com' in domain or '.in' in domain:
+                if _UPI_PUBLIC_DOMAIN.search(domain):
                     return 0.2
                 return 0.85
         
         return base_conf
     
-    def _has_context(self, text: str, start: int, end: int, pii_type: str) -> bool:
-        """Fast context check - look 100 chars around match."""
-        context_start = max(0, start - 100)
-        context_end = min(len(text), end + 100)
-        context = text[context_start:context_end]
-        
+    def _has_context(self, spans: Dict[str, Tuple[List[int], List[int]]], text: str,
+                     start: int, end: int, pii_type: str) -> bool:
+        """
+        Fast context check - keyword within 100 chars around match.
+        Each type's keywords are found once per text and cached in spans
+        as (starts, ends), so every later check is a bisect.
+        """
         pattern = self.context_keywords.get(pii_type)
-        if pattern:
-            return bool(pattern.search(context))
-        return False
+        if pattern is None:
+            return False
+        found = spans.get(pii_type)
+        if found is None:
+            matches = [m.span() for m in pattern.finditer(text)]
+            found = spans[pii_type] = ([s for s, _ in matches], [e for _, e in matches])
+        starts, ends = found
+        # Keyword matches don't overlap, so ends are sorted along with starts
+        i = bisect_left(starts, max(0, start - 100))
+        return i < len(starts) and ends[i] <= min(len(text), end + 100)
     
     def scan_text_advanced(self, text: str) -> List[Dict[str, Any]]:
         """
         Ultra-fast context-aware scanning.
         Single-pass with context boost for confidence.
         """
+        return [dict(hit.as_dict(), context=hit.context) for hit in self._scan_hits(text)]
+    
+    def _scan_hits(self, text: str) -> List[PIIHit]:
+        """scan_text_advanced as PIIHits."""
         if not text or len(text.strip()) < 2:
             return []
         
         start_time = time.time()
         results = []
         seen_positions = set()  # (start, end, type) for fast lookup
-        
-        # Single pass: scan all patterns
-        for pii_type, pattern in self.patterns.items():
+        context_spans = {}  # pii_type -> keyword (starts, ends), see _has_context
+        
+        # Single pass: scan all patterns (re.ASCII copies for ASCII-only text)
+        if _ASCII_UNSAFE_CHARS.search(text):
+            patterns = self.patterns
+        else:
+            patterns = self.base_detector.ascii_patterns
+        for pii_type, pattern in patterns.items():
+            mixed_only = pii_type in _MIXED_TOKEN_TYPES
             for match in pattern.finditer(text):
                 start_pos = match.start()
                 end_pos = match.end()
                 
                 # Extract value
                 val = match.group(1) if match.groups() and match.group(1) else match.group(0)
+                if mixed_only and not is_mixed_token(val):
+                    continue
                 val_stripped = val.strip()
                 
                 if len(val_stripped) < 2:
@@ -137,31 +161,23 @@ class ContextAwarePIIDetector:
                     continue
                 
                 # Normalize
-                norm = re.sub(r'\s+', '', val)
+                norm = ''.join(val.split())
                 
                 # Calculate base confidence
                 conf = self._calculate_confidence_fast(pii_type, val, norm)
                 
                 # Context boost: if context keyword nearby, increase confidence
-                if self._has_context(text, start_pos, end_pos, pii_type):
+                has_context = self._has_context(context_spans, text, start_pos, end_pos, pii_type)
+                if has_context:
                     conf = min(0.95, conf + 0.1)
                 
                 # Filter low-confidence context-dependent types
                 if conf < 0.5 and pii_type in ("address", "username", "password"):
-                    if not self._has_context(text, start_pos, end_pos, pii_type):
+                    if not has_context:
                         continue
                 
-                result = {
-                    "type": pii_type.upper(),
-                    "match": val,
-                    "normalized": norm,
-                    "confidence": round(conf, 2),
-                    "start": start_pos,
-                    "end": end_pos,
-                    "context": self._has_context(text, start_pos, end_pos, pii_type)
-                }
-                
-                results.append(result)
+                results.append(PIIHit(pii_type.upper(), val, norm, round(conf, 2),
+                                      start_pos, end_pos, has_context))
                 seen_positions.add(pos_key)
         
         # Fast deduplication
@@ -180,25 +196,23 @@ class ContextAwarePIIDetector:
         """
         Main detection interface compatible with existing codebase.
         """
-        scan_results = self.scan_text_advanced(text)
-        
         # Convert to expected format
         results = []
-        for item in scan_results:
+        for hit in self._scan_hits(text):
             result = {
-                'type': item['type'],
-                'value': item['match'],
-                'normalized': item.get('normalized', item['match']),
-                'start': item.get('start', 0),
-                'end': item.get('end', 0),
+                'type': hit.type,
+                'value': hit.match,
+                'normalized': hit.normalized,
+                'start': hit.start,
+                'end': hit.end,
                 'page': page_num,
-                'confidence': item.get('confidence', 0.8)
+                'confidence': hit.confidence
             }
             
             if bbox:
                 result['bbox'] = bbox
             
-            if item.get('context'):
+            if hit.context:
                 result['context'] = True
             
             results.append(result)
@@ -217,3 +231,14 @@ class ContextAwarePIIDetector:
 
 # Global instance
 advanced_pii_detector = ContextAwarePIIDetector()
+
+# One detector per worker thread: scans update per-detector stats
+_detector_tls = threading.local()
+
+
+def get_advanced_detector() -> ContextAwarePIIDetector:
+    """Get the calling thread's ContextAwarePIIDetector, creating it on first use."""
+    detector = getattr(_detector_tls, 'detector', None)
+    if detector is None:
+        detector = _detector_tls.detector = ContextAwarePIIDetector()
+    return detector
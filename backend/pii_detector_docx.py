@@ -4,13 +4,282 @@ Extracts text from DOCX files and detects PII with document structure awareness
 Uses advanced PII detector with 40+ patterns
 """
 
+import json
 import logging
-from typing import List, Dict
-from docx import Document
-from pii_detector import pii_detector  # Use advanced detector with ALL patterns
+import os
+import posixpath
+import sys
+import zipfile
+from collections import defaultdict
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, BinaryIO, Iterable, Iterator, Sequence, Tuple, Union
+import numpy as np
+from lxml import etree
+from pii_detector import PIIHit, get_detector, _get_scan_pool  # Use advanced detector with ALL patterns
+from pii_detection_patterns import pii_detector  # Labelled patterns for element-level results
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_R_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_OFFICE_DOCUMENT_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+_W_P, _W_TBL, _W_TR, _W_TC = W_NS + 'p', W_NS + 'tbl', W_NS + 'tr', W_NS + 'tc'
+_W_R, _W_T, _W_BR, _W_HYPERLINK = W_NS + 'r', W_NS + 't', W_NS + 'br', W_NS + 'hyperlink'
+_W_BODY, _W_SECT_PR, _W_VAL, _W_TYPE = W_NS + 'body', W_NS + 'sectPr', W_NS + 'val', W_NS + 'type'
+_W_TC_PR, _W_GRID_SPAN, _W_V_MERGE = W_NS + 'tcPr', W_NS + 'gridSpan', W_NS + 'vMerge'
+
+# Text of the other run children python-docx maps to characters
+_W_NO_BREAK_HYPHEN = W_NS + 'noBreakHyphen'
+_RUN_CHARS = {W_NS + 'tab': '\t', W_NS + 'ptab': '\t', W_NS + 'cr': '\n', _W_NO_BREAK_HYPHEN: '-'}
+
+# Parsed DOCX files kept by (path, mtime, size); rescanning an unchanged
+# file skips the parse
+_PARSE_CACHE_SIZE = 32
+
+# Element texts are scanned as one string joined with this. No pattern in
+# pii_detection_patterns matches a NUL, so a match can't span two elements,
+# and a NUL is a word boundary just like the start or end of the text.
+# (\x1e would not do: it is \s to Python's re.)
+_ELEMENT_SEPARATOR = '\x00'
+
+# By-element scans of at least this much text are split into shards of about
+# _SHARD_TEXT characters (whole elements) and run on the shared process pool
+_PARALLEL_MIN_TEXT = 65536
+_SHARD_TEXT = 32768
+
+# detect_pii_in_docx splits texts this long into overlapping chunks scanned
+# on the shared process pool (PIIDetector.scan_text_parallel)
+_PARALLEL_SCAN_TEXT = 200_000
+
+# iter_detect_pii_in_docx scans this many lines per detect_pii_batch call
+_STREAM_BATCH = 256
+
+# Uploaded DOCX files are untrusted: never fetch or expand entities
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+def _run_text(run) -> str:
+    """Text of a <w:r>, as python-docx's Run.text renders it"""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _W_T:
+            parts.append(child.text or '')
+        elif tag == _W_BR:
+            # Page and column breaks carry no text
+            if child.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        else:
+            char = _RUN_CHARS.get(tag)
+            if char:
+                parts.append(char)
+    return ''.join(parts)
+
+
+def _paragraph_text(p) -> str:
+    """Text of a <w:p>: its runs, including those inside hyperlinks"""
+    parts = []
+    for child in p:
+        if child.tag == _W_R:
+            parts.append(_run_text(child))
+        elif child.tag == _W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child if r.tag == _W_R)
+    return ''.join(parts)
+
+
+def _has_text(p) -> bool:
+    """
+    Whether a <w:p> can have non-blank text: only <w:t> and
+    <w:noBreakHyphen> render visible characters, so a paragraph with
+    neither is blank without building its text
+    """
+    return next(p.iter(_W_T, _W_NO_BREAK_HYPHEN), None) is not None
+
+
+def _int_prop(props, name: str, default: int) -> int:
+    """Integer w:val of props/<w:name>, default when absent"""
+    prop = props.find(W_NS + name) if props is not None else None
+    return default if prop is None else int(prop.get(_W_VAL))
+
+
+def _table_rows(tbl) -> List[str]:
+    """
+    Row texts of a <w:tbl>, cells joined with " | " like
+    " | ".join(cell.text for cell in row.cells): a cell spanning columns
+    repeats, and a vertically merged cell shows the text of its first row
+    """
+    rows = []
+    above = None
+    for tr in tbl.iterchildren(_W_TR):
+        offset = _int_prop(tr.find(W_NS + 'trPr'), 'gridBefore', 0)
+        cells = []
+        current = {}  # grid offset -> (text, span) of the cell holding the content
+        for tc in tr.iterchildren(_W_TC):
+            # One walk over the cell's children and properties: each
+            # find() re-resolves its path, several per cell on wide tables
+            span = 1
+            v_merge = None
+            paragraphs = []
+            for child in tc:
+                if child.tag == _W_P:
+                    paragraphs.append(child)
+                elif child.tag == _W_TC_PR:
+                    for prop in child:
+                        if prop.tag == _W_GRID_SPAN:
+                            span = int(prop.get(_W_VAL))
+                        elif prop.tag == _W_V_MERGE:
+                            v_merge = prop.get(_W_VAL, 'continue')
+            if v_merge == 'continue':
+                if above is None or offset not in above:
+                    raise ValueError(f"no cell above grid offset {offset} to continue")
+                cell = above[offset]
+            else:
+                cell = ('\n'.join([_paragraph_text(p) for p in paragraphs]), span)
+            current[offset] = cell
+            cells.extend([cell[0]] * cell[1])
+            offset += span
+        rows.append(" | ".join(cells))
+        above = current
+    return rows
+
+
+def _part_path(source: str, target: str) -> str:
+    """Zip member name of a relationship target relative to source's folder"""
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source), target))
+
+
+def _relationships(zf: zipfile.ZipFile, part: str) -> Dict[str, Tuple[str, str]]:
+    """rId -> (relationship type, zip member name) for a part's internal relationships"""
+    rels_name = posixpath.join(posixpath.dirname(part), '_rels', posixpath.basename(part) + '.rels')
+    if rels_name not in zf.NameToInfo:
+        return {}
+    rels = {}
+    for rel in etree.fromstring(zf.read(rels_name), _XML_PARSER).iterchildren(_REL_NS + 'Relationship'):
+        if rel.get('TargetMode') != 'External':
+            rels[rel.get('Id')] = (rel.get('Type'), _part_path(part, rel.get('Target')))
+    return rels
+
+
+def _main_part(zf: zipfile.ZipFile) -> str:
+    """Zip member name of the main document part"""
+    for rel_type, name in _relationships(zf, '').values():
+        if rel_type == _OFFICE_DOCUMENT_REL:
+            return name
+    raise KeyError("no officeDocument relationship in package")
+
+
+def _iter_body(zf: zipfile.ZipFile, part: str, sections: List[Dict[str, str]]) -> Iterator[Tuple[str, int, object]]:
+    """
+    Stream the body of the main document part in document order
+    
+    Yields ('paragraph', number, text) for every body paragraph, with ''
+    for blank ones (often half of a document's paragraphs), and ('table', number, row_texts) for every body table. Each
+    section's default header/footer rIds are appended to sections. Handled
+    elements are freed as the parse goes, so memory stays bounded by the
+    largest paragraph or table rather than the document.
+    """
+    para_num = table_num = 0
+    with zf.open(part) as xml:
+        for _, elem in etree.iterparse(xml, events=('end',), tag=(_W_P, _W_TBL, _W_SECT_PR),
+                                       resolve_entities=False, no_network=True):
+            parent = elem.getparent()
+            if parent.tag != _W_BODY:
+                # A section break other than the last lives in a body paragraph's pPr
+                if elem.tag == _W_SECT_PR and parent.tag == W_NS + 'pPr' \
+                        and parent.getparent().getparent().tag == _W_BODY:
+                    sections.append(_section_refs(elem))
+                continue
+            
+            if elem.tag == _W_P:
+                para_num += 1
+                yield 'paragraph', para_num, _paragraph_text(elem) if _has_text(elem) else ''
+            elif elem.tag == _W_TBL:
+                table_num += 1
+                yield 'table', table_num, _table_rows(elem)
+            else:
+                sections.append(_section_refs(elem))
+            
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def _detect_elements(texts: List[str]) -> List[List[Dict]]:
+    """
+    pii_detector.detect() for each text, as one scan of the texts joined
+    with _ELEMENT_SEPARATOR; each detection goes back to its text by start
+    offset, with element-relative start_pos/end_pos
+    """
+    hits = [[] for _ in texts]
+    detections = pii_detector.detect(_ELEMENT_SEPARATOR.join(texts))
+    if not detections:
+        return hits
+    
+    # Element start offsets, and every detection's element found in one
+    # vectorized binary search instead of a bisect call per detection
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    offsets = np.zeros(len(texts), dtype=np.int64)
+    np.cumsum(lengths[:-1] + len(_ELEMENT_SEPARATOR), out=offsets[1:])
+    starts = np.fromiter((d['start_pos'] for d in detections), dtype=np.int64, count=len(detections))
+    indices = np.searchsorted(offsets, starts, side='right') - 1
+    
+    for detection, index, base in zip(detections, indices.tolist(), offsets[indices].tolist()):
+        detection['start_pos'] -= base
+        detection['end_pos'] -= base
+        hits[index].append(detection)
+    return hits
+
+
+def _shard_elements(texts: List[str]) -> List[List[str]]:
+    """Split texts into consecutive runs of about _SHARD_TEXT characters"""
+    shards = [[]]
+    size = 0
+    for text in texts:
+        if size >= _SHARD_TEXT:
+            shards.append([])
+            size = 0
+        shards[-1].append(text)
+        size += len(text)
+    return shards
+
+
+def _section_refs(sect_pr) -> Dict[str, str]:
+    """Default header/footer rIds of a <w:sectPr>"""
+    refs = {}
+    for kind in ('header', 'footer'):
+        for ref in sect_pr.iterchildren(W_NS + kind + 'Reference'):
+            if ref.get(_W_TYPE) == 'default':
+                refs[kind] = ref.get(_R_NS + 'id')
+    return refs
+
+
+def _has_headerfooter(zf: zipfile.ZipFile, part: str, sections: List[Dict[str, str]], kind: str) -> bool:
+    """
+    any(section.header.paragraphs for section in doc.sections), or footer:
+    a section without its own definition inherits the previous section's,
+    and python-docx adds a one-paragraph definition when none precedes it
+    """
+    rels = _relationships(zf, part)
+    r_id = None
+    for refs in sections:
+        r_id = refs.get(kind, r_id)
+        if r_id is None:
+            return True
+        root = etree.fromstring(zf.read(rels[r_id][1]), _XML_PARSER)
+        if root.find(_W_P) is not None:
+            return True
+    return False
+
 
 class DOCXPIIDetector:
     """DOCX-specific PII detection (OPTIMIZED)"""
@@ -19,39 +288,86 @@ class DOCXPIIDetector:
         # No need to initialize - just extract and return text
         pass
     
-    def extract_text_from_docx(self, docx_path: str) -> str:
+    def extract_text_from_docx(self, docx_path: Union[str, BinaryIO]) -> str:
         """
         Extract text from DOCX file
         
         Args:
-            docx_path: Path to DOCX file
+            docx_path: Path to DOCX file, or a binary file object
             
         Returns:
             str: Extracted text
         """
         try:
-            doc = Document(docx_path)
-            text = ""
-            
-            # Extract from paragraphs
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    text += para.text + "\n"
-            
-            # Extract from tables
-            for table in doc.tables:
-                text += "\n--- TABLE ---\n"
-                for row in table.rows:
-                    row_text = " | ".join(cell.text for cell in row.cells)
-                    if row_text.strip():
-                        text += row_text + "\n"
-            
-            return text
-        
+            return self._parse_docx(docx_path)[0]
         except Exception as e:
             logger.error(f"Failed to extract text from DOCX: {e}")
             return ""
     
+    @staticmethod
+    def _parse_docx(docx_path: Union[str, BinaryIO]) -> Tuple[str, Dict]:
+        """
+        _read_docx, memoized for paths on (path, mtime, size)
+        
+        Returns:
+            tuple: (text, structure dict) - the dict is the caller's own copy
+        """
+        if not isinstance(docx_path, str):
+            return DOCXPIIDetector._read_docx(docx_path)
+        stat = os.stat(docx_path)
+        text, structure = _read_docx_file(docx_path, stat.st_mtime_ns, stat.st_size)
+        return text, dict(structure)
+    
+    @staticmethod
+    def _read_docx(docx_path: Union[str, BinaryIO]) -> Tuple[str, Dict]:
+        """
+        Extract text and document structure in one streaming pass
+        
+        Reads word/document.xml straight from the zip with iterparse instead
+        of building a python-docx Document, so large documents are never
+        held in memory as a full object tree. Text matches the old
+        Document-based extraction: non-blank paragraphs first, then each
+        table's non-blank rows.
+        
+        Returns:
+            tuple: (text, structure dict)
+        """
+        paragraphs = []
+        tables = []
+        sections = []
+        para_count = table_count = 0
+        with zipfile.ZipFile(docx_path) as zf:
+            part = _main_part(zf)
+            for kind, number, content in _iter_body(zf, part, sections):
+                if kind == 'paragraph':
+                    para_count = number
+                    if content.strip():
+                        paragraphs.append(content)
+                        paragraphs.append("\n")
+                else:
+                    table_count = number
+                    tables.append("\n--- TABLE ---\n")
+                    for row in content:
+                        if row.strip():
+                            tables.append(row)
+                            tables.append("\n")
+            
+            try:
+                structure = {
+                    'total_paragraphs': para_count,
+                    'total_tables': table_count,
+                    'total_sections': len(sections),
+                    'has_headers': _has_headerfooter(zf, part, sections, 'header'),
+                    'has_footers': _has_headerfooter(zf, part, sections, 'footer')
+                }
+            except Exception:
+                structure = {}
+        
+        # One join over both lists: the text is copied once, with no
+        # per-line or half-document temporaries
+        paragraphs.extend(tables)
+        return "".join(paragraphs), structure
+    
     def detect_pii_in_docx(self, docx_path: str) -> Dict:
         """
         Detect PII in DOCX file using ADVANCED detector (40+ patterns)
@@ -63,8 +379,12 @@ class DOCXPIIDetector:
             dict: Detection results
         """
         try:
-            # Extract text
-            text = self.extract_text_from_docx(docx_path)
+            # Extract text and structure in a single pass
+            try:
+                text, doc_structure = self._parse_docx(docx_path)
+            except Exception as e:
+                logger.error(f"Failed to extract text from DOCX: {e}")
+                text = ""
             
             if not text:
                 return {
@@ -75,27 +395,13 @@ class DOCXPIIDetector:
             
             # Use ADVANCED detector with all patterns
             logger.info(f"Scanning DOCX with advanced detector (40+ patterns)...")
-            detections = pii_detector.scan_text(text)
-            
-            # Format detections
-            formatted_detections = []
-            for detection in detections:
-                formatted_detections.append({
-                    'type': detection.get('type', 'UNKNOWN'),
-                    'value': detection.get('match', detection.get('value', '')),
-                    'confidence': detection.get('confidence', 0.5),
-                    'start': detection.get('start', 0),
-                    'end': detection.get('end', 0)
-                })
+            formatted_detections = list(self._format_hits(self._scan_hits(text)))
             
             logger.info(f"✓ Found {len(formatted_detections)} PII instances in DOCX")
             
             # Categorize detections
             categorized = self._categorize_detections(formatted_detections)
             
-            # Document structure analysis
-            doc_structure = self._analyze_document_structure(docx_path)
-            
             return {
                 'success': True,
                 'file': docx_path,
@@ -115,6 +421,106 @@ class DOCXPIIDetector:
                 'detections': []
             }
     
+    def iter_formatted_detections(self, docx_path: Union[str, BinaryIO]) -> Iterator[Dict]:
+        """
+        detect_pii_in_docx's detections, one at a time
+        
+        For callers that write results out (JSON, DB rows): the detection
+        dicts are built as they are consumed instead of held in one list.
+        Unlike detect_pii_in_docx, errors are raised rather than reported.
+        
+        Args:
+            docx_path: Path to DOCX file, or a binary file object
+            
+        Yields:
+            dict: One detection
+        """
+        text, _ = self._parse_docx(docx_path)
+        yield from self._format_hits(self._scan_hits(text))
+    
+    @staticmethod
+    def _scan_hits(text: str) -> Sequence[PIIHit]:
+        """PIIHits for extracted text, on the process pool when it is very large"""
+        detector = get_detector()
+        if len(text) >= _PARALLEL_SCAN_TEXT and (os.cpu_count() or 1) > 1:
+            return detector._scan_hits_parallel(text)
+        return detector._scan_hits(text)
+    
+    @staticmethod
+    def _format_hits(hits: Iterable[PIIHit]) -> Iterator[Dict]:
+        """
+        Detection dicts straight from the detector's PIIHits, skipping the
+        intermediate scan_text dicts. Types are interned so hits unpickled
+        from the process pool share one string per type again; the generic
+        patterns carry no category.
+        """
+        for hit in hits:
+            yield {
+                'type': sys.intern(hit.type),
+                'value': hit.match,
+                'confidence': hit.confidence,
+                'start': hit.start,
+                'end': hit.end,
+                'category': 'UNKNOWN'
+            }
+    
+    def iter_detect_pii_in_docx(self, docx_path: Union[str, BinaryIO]) -> Iterator[Dict]:
+        """
+        Stream PII detections from a DOCX file, for callers that write
+        results out (JSONL, DB rows) instead of holding them
+        
+        Detections have detect_pii_in_docx's format, with offsets into the
+        extract_text_from_docx text. Paragraph detections are yielded as the
+        XML is parsed; table rows come after the body, as in the extracted
+        text, so only table text is buffered. Each line is scanned on its
+        own, so unlike detect_pii_in_docx a match never spans two lines.
+        
+        Args:
+            docx_path: Path to DOCX file, or a binary file object
+            
+        Yields:
+            dict: One detection
+        """
+        lines = []  # (offset in extracted text, line) awaiting a scan
+        tables = []
+        offset = 0
+        with zipfile.ZipFile(docx_path) as zf:
+            for kind, _, content in _iter_body(zf, _main_part(zf), []):
+                if kind == 'table':
+                    tables.append(content)
+                elif content.strip():
+                    lines.append((offset, content))
+                    offset += len(content) + 1
+                    if len(lines) >= _STREAM_BATCH:
+                        yield from self._scan_lines(lines)
+                        lines = []
+        
+        for rows in tables:
+            offset += len("\n--- TABLE ---\n")
+            for row in rows:
+                if row.strip():
+                    lines.append((offset, row))
+                    offset += len(row) + 1
+                    if len(lines) >= _STREAM_BATCH:
+                        yield from self._scan_lines(lines)
+                        lines = []
+        yield from self._scan_lines(lines)
+    
+    @staticmethod
+    def _scan_lines(lines: List[Tuple[int, str]]) -> Iterator[Dict]:
+        """Detections for (offset, line) pairs, shifted to the lines' offsets"""
+        results = get_detector().detect_pii_batch([line for _, line in lines])
+        for (offset, _), detections in zip(lines, results):
+            for detection in detections:
+                yield {
+                    'type': sys.intern(detection['type']),
+                    'value': detection['value'],
+                    'confidence': detection['confidence'],
+                    'start': detection['start'] + offset,
+                    'end': detection['end'] + offset,
+                    'category': 'UNKNOWN'
+                }
+    
     def detect_pii_in_docx_by_element(self, docx_path: str) -> Dict:
         """
         Detect PII in DOCX with element-level granularity (paragraphs, tables)
@@ -126,49 +532,45 @@ class DOCXPIIDetector:
             dict: Detection results organized by document elements
         """
         try:
-            doc = Document(docx_path)
+            # Non-blank elements as (key, element info, text); paragraphs
+            # are listed before table rows
+            paragraphs = []
+            rows = []
+            with zipfile.ZipFile(docx_path) as zf:
+                for kind, number, content in _iter_body(zf, _main_part(zf), []):
+                    if kind == 'paragraph':
+                        if content.strip():
+                            paragraphs.append((f'para_{number}',
+                                               {'type': 'paragraph', 'element_number': number},
+                                               content))
+                        continue
+                    for row_num, row_text in enumerate(content, 1):
+                        if row_text.strip():
+                            rows.append((f'table_{number}_row_{row_num}',
+                                         {'type': 'table_row', 'table_number': number, 'row_number': row_num},
+                                         row_text))
+            elements = paragraphs + rows
+            
+            texts = [text for _, _, text in elements]
+            if sum(map(len, texts)) < _PARALLEL_MIN_TEXT:
+                element_hits = _detect_elements(texts)
+            else:
+                # Big documents: shards of whole elements on the shared process pool
+                shards = _shard_elements(texts)
+                element_hits = list(chain.from_iterable(_get_scan_pool().map(_detect_elements, shards)))
+            
             element_detections = {}
             all_detections = []
-            
-            element_num = 1
-            
-            # Process paragraphs
-            for para_num, para in enumerate(doc.paragraphs, 1):
-                if para.text.strip():
-                    detections = self.pii_detector.detect(para.text)
-                    
-                    if detections:
-                        key = f'para_{para_num}'
-                        element_detections[key] = {
-                            'type': 'paragraph',
-                            'element_number': para_num,
-                            'content': para.text[:100] + '...' if len(para.text) > 100 else para.text,
-                            'pii_count': len(detections),
-                            'detections': detections,
-                            'summary': self.pii_detector.get_pii_summary(detections)
-                        }
-                        all_detections.extend(detections)
-            
-            # Process tables
-            for table_num, table in enumerate(doc.tables, 1):
-                for row_num, row in enumerate(table.rows, 1):
-                    row_text = " | ".join(cell.text for cell in row.cells)
-                    
-                    if row_text.strip():
-                        detections = self.pii_detector.detect(row_text)
-                        
-                        if detections:
-                            key = f'table_{table_num}_row_{row_num}'
-                            element_detections[key] = {
-                                'type': 'table_row',
-                                'table_number': table_num,
-                                'row_number': row_num,
-                                'content': row_text[:100] + '...' if len(row_text) > 100 else row_text,
-                                'pii_count': len(detections),
-                                'detections': detections,
-                                'summary': self.pii_detector.get_pii_summary(detections)
-                            }
-                            all_detections.extend(detections)
+            for (key, info, text), detections in zip(elements, element_hits):
+                if detections:
+                    element_detections[key] = dict(
+                        info,
+                        content=text[:100] + '...' if len(text) > 100 else text,
+                        pii_count=len(detections),
+                        detections=detections,
+                        summary=pii_detector.get_pii_summary(detections)
+                    )
+                    all_detections.extend(detections)
             
             return {
                 'success': True,
@@ -188,39 +590,35 @@ class DOCXPIIDetector:
             }
     
     @staticmethod
-    def _analyze_document_structure(docx_path: str) -> Dict:
-        """Analyze DOCX document structure"""
-        try:
-            doc = Document(docx_path)
-            
-            return {
-                'total_paragraphs': len(doc.paragraphs),
-                'total_tables': len(doc.tables),
-                'total_sections': len(doc.sections),
-                'has_headers': any(section.header.paragraphs for section in doc.sections),
-                'has_footers': any(section.footer.paragraphs for section in doc.sections)
-            }
-        except:
-            return {}
+    def to_json_bytes(result: Dict) -> bytes:
+        """
+        Serialize a detection result to UTF-8 JSON bytes
+        
+        Uses orjson when installed (several times faster on large detection
+        lists, and no intermediate str), else the json module.
+        
+        Returns:
+            bytes: JSON document
+        """
+        if orjson is None:
+            return json.dumps(result, ensure_ascii=False).encode('utf-8')
+        return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
     
     @staticmethod
     def _categorize_detections(detections: List[Dict]) -> Dict:
         """Categorize detections by type and category"""
-        categorized = {}
+        categorized = defaultdict(lambda: defaultdict(list))
         
         for detection in detections:
-            category = detection['category']
-            pii_type = detection['type']
-            
-            if category not in categorized:
-                categorized[category] = {}
-            
-            if pii_type not in categorized[category]:
-                categorized[category][pii_type] = []
-            
-            categorized[category][pii_type].append(detection)
+            categorized[detection['category']][detection['type']].append(detection)
         
-        return categorized
+        return {category: dict(types) for category, types in categorized.items()}
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _read_docx_file(path: str, mtime_ns: int, size: int) -> Tuple[str, Dict]:
+    """DOCXPIIDetector._read_docx for a path; mtime_ns and size only key the cache"""
+    return DOCXPIIDetector._read_docx(path)
 
 
 # Export detector instance
@@ -15,10 +15,39 @@ import re
 import logging
 from typing import List, Dict, Tuple, Optional, Set
 from functools import lru_cache
+from operator import itemgetter
+
+from pii_detector import aadhaar_digit_matrix, verhoeff_check_batch
+
+try:
+    import ahocorasick  # pyahocorasick: one keyword pass picks the label types to run
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2  # google-re2: linear-time matching for plain ASCII text
+except ImportError:
+    re2 = None
 
 logger = logging.getLogger(__name__)
 
-# LABEL PATTERNS - These are searched FIRST
+# Non-ASCII characters re.IGNORECASE matches to an ASCII letter, mapped to
+# that letter so lowercased text finds every keyword the patterns can match
+_IGNORECASE_FOLD = str.maketrans({'\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k'})
+
+# RE2's \d, \w and \s are ASCII-only, and Python's str \s also matches \x0b
+# and \x1c-\x1f, which RE2's does not. Texts containing anything outside
+# this set are matched with the re patterns, so RE2 never changes a match.
+_RE2_UNSAFE_CHARS = re.compile(r'[^\x00-\x0a\x0c-\x1b\x20-\x7f]')
+
+# detect_by_labels memoization: page headers, footers and form templates
+# repeat across pages and documents; the length cap keeps the cache's
+# worst case around 16MB of keys
+_DETECT_CACHE_SIZE = 1024
+_DETECT_CACHE_MAX_TEXT = 16384
+
+# LABEL PATTERNS - These are searched FIRST. "triggers" lists lowercase
+# keywords at least one of which every match of the label's patterns contains
 LABEL_PATTERNS = {
     # Credentials Labels
     "USERNAME": {
@@ -27,6 +56,7 @@ LABEL_PATTERNS = {
             r"//\s*Username\s*[:=]\s*([^\n]+)",  # Handle comments
             r"#\s*Username\s*[:=]\s*([^\n]+)",   # Handle Python comments
         ],
+        "triggers": ["user", "login"],
         "category": "Credentials",
         "pii_type": "USERNAME"
     },
@@ -36,6 +66,7 @@ LABEL_PATTERNS = {
             r"//\s*Password\s*[:=]\s*([^\n]+)",  # Handle comments
             r"#\s*Password\s*[:=]\s*([^\n]+)",   # Handle Python comments
         ],
+        "triggers": ["pass", "pwd"],
         "category": "Credentials",
         "pii_type": "PASSWORD"
     },
@@ -45,6 +76,7 @@ LABEL_PATTERNS = {
             r"//\s*(?:API[_\s]?Key|apiKey)\s*[:=]\s*([^\n]+)",  # Handle comments
             r"#\s*(?:API[_\s]?Key|apiKey)\s*[:=]\s*([^\n]+)",   # Handle Python comments
         ],
+        "triggers": ["api", "secret", "token"],
         "category": "Credentials",
         "pii_type": "API_KEY"
     },
@@ -54,6 +86,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:email|e-mail|email\s*address|contact\s*email)\s*[:=]\s*([a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})",
         ],
+        "triggers": ["mail"],
         "category": "Contact",
         "pii_type": "EMAIL"
     },
@@ -61,6 +94,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:phone|mobile|contact|tel|telephone)\s*[:=]\s*(\+?91[\s\-]?[6-9]\d{3}[\s\-]?\d{5}|\d{10,12})",
         ],
+        "triggers": ["phone", "mobile", "contact", "tel"],
         "category": "Contact",
         "pii_type": "PHONE"
     },
@@ -70,6 +104,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:name|full\s*name|user\s*name)\s*[:=]\s*([A-Za-z\s]+)",
         ],
+        "triggers": ["name"],
         "category": "Personal",
         "pii_type": "NAME"
     },
@@ -77,6 +112,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:dob|date\s*of\s*birth|birth\s*date|born)\s*[:=]\s*(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})",
         ],
+        "triggers": ["dob", "birth", "born"],
         "category": "Personal",
         "pii_type": "DOB"
     },
@@ -84,6 +120,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:address|location|residence)\s*[:=]\s*([^\n;]+)",
         ],
+        "triggers": ["address", "location", "residence"],
         "category": "Personal",
         "pii_type": "ADDRESS"
     },
@@ -95,6 +132,7 @@ LABEL_PATTERNS = {
             r"//\s*(?:Account|Bank\s*details)\s*[:=]\s*(\d{10,18})",  # Handle comments
             r"#\s*(?:Account|Bank\s*details)\s*[:=]\s*(\d{10,18})",   # Handle Python comments
         ],
+        "triggers": ["account", "a/c", "bank"],
         "category": "Financial",
         "pii_type": "BANK_ACCOUNT"
     },
@@ -106,6 +144,7 @@ LABEL_PATTERNS = {
             r"//\s*IFSC\s*[:=]\s*([A-Z0-9]+)",  # Handle comments (flexible)
             r"#\s*IFSC\s*[:=]\s*([A-Z0-9]+)",   # Handle Python comments (flexible)
         ],
+        "triggers": ["ifsc"],
         "category": "Financial",
         "pii_type": "IFSC"
     },
@@ -113,6 +152,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:upi|upi\s*id|vpa)\s*[:=]\s*([a-zA-Z0-9._\-]+@[a-z0-9._\-]+)",
         ],
+        "triggers": ["upi", "vpa"],
         "category": "Financial",
         "pii_type": "UPI"
     },
@@ -120,6 +160,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:card|card\s*number|credit\s*card)\s*[:=]\s*(\d{4}[\s\-]?\d{4}[\s\-]?\d{4}[\s\-]?\d{4})",
         ],
+        "triggers": ["card"],
         "category": "Financial",
         "pii_type": "CARD_NUMBER"
     },
@@ -127,6 +168,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:salary|income|amount|compensation)\s*[:=]\s*(?:₹|Rs\.?)?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)",
         ],
+        "triggers": ["salary", "income", "amount", "compensation"],
         "category": "Financial",
         "pii_type": "SALARY"
     },
@@ -136,6 +178,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:aadhaar|aadhar|uid)\s*[:=]\s*(\d{4}[\s\-]?\d{4}[\s\-]?\d{4}|\d{12})",
         ],
+        "triggers": ["aadha", "uid"],
         "category": "Government ID",
         "pii_type": "AADHAAR"
     },
@@ -143,6 +186,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:pan|pan\s*number|permanent\s*account\s*number)\s*[:=]\s*([A-Z]{5}\d{4}[A-Z])",
         ],
+        "triggers": ["pan", "permanent"],
         "category": "Government ID",
         "pii_type": "PAN"
     },
@@ -150,6 +194,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:passport|passport\s*number|passport\s*no)\s*[:=]\s*([A-Z]\d{7})",
         ],
+        "triggers": ["passport"],
         "category": "Government ID",
         "pii_type": "PASSPORT"
     },
@@ -157,6 +202,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:voter|voter\s*id|epic|voter\s*number)\s*[:=]\s*([A-Z]{3}\d{7})",
         ],
+        "triggers": ["voter", "epic"],
         "category": "Government ID",
         "pii_type": "VOTER_ID"
     },
@@ -164,6 +210,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:driving\s*license|dl|license\s*number|license\s*no|dlno)\s*[:=]\s*([A-Z]{2}\s*\d{2}\s*\d{4,11}|\w{2}\d{13})",
         ],
+        "triggers": ["driving", "dl", "license"],
         "category": "Government ID",
         "pii_type": "DRIVING_LICENSE"
     },
@@ -171,6 +218,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:gstin|gst|gst\s*number)\s*[:=]\s*([0-9]{2}[A-Z]{5}[0-9]{4}[A-Z][A-Z0-9]Z[A-Z0-9])",
         ],
+        "triggers": ["gst"],
         "category": "Government ID",
         "pii_type": "GSTIN"
     },
@@ -178,6 +226,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:cin|company\s*identification\s*number)\s*[:=]\s*([LUCFWB]\d{5}[A-Z]{2}\d{4}PTC\d{6})",
         ],
+        "triggers": ["cin", "company"],
         "category": "Government ID",
         "pii_type": "CIN"
     },
@@ -185,6 +234,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:epf|epf\s*number|provident\s*fund)\s*[:=]\s*([A-Z]{2}\d{7,10})",
         ],
+        "triggers": ["epf", "provident"],
         "category": "Government ID",
         "pii_type": "EPF"
     },
@@ -192,6 +242,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:ration\s*card|ration\s*card\s*number)\s*[:=]\s*([A-Z]{2}\d{10,12})",
         ],
+        "triggers": ["ration"],
         "category": "Government ID",
         "pii_type": "RATION_CARD"
     },
@@ -201,6 +252,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:employee\s*id|emp\s*id|emp\s*no|staff\s*id|employee\s*number|empid)\s*[:=]\s*(EMP\d{4}|[A-Z]{2}\d{4})",
         ],
+        "triggers": ["emp", "staff"],
         "category": "Employment",
         "pii_type": "EMPLOYEE_ID"
     },
@@ -208,6 +260,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:roll\s*(?:number|no)|student\s*id|roll|roll\s*no|admission\s*number)\s*[:=]\s*(SR(?:202[0-4])\d{5}|[A-Z]{3}\d{7})",
         ],
+        "triggers": ["roll", "student", "admission"],
         "category": "Education",
         "pii_type": "STUDENT_ROLL"
     },
@@ -215,6 +268,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:customer\s*(?:id|number)|cust\s*(?:id|no))\s*[:=]\s*(CUST\d{6})",
         ],
+        "triggers": ["cust"],
         "category": "Custom ID",
         "pii_type": "CUSTOMER_ID"
     },
@@ -222,6 +276,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:order\s*(?:id|number)|order\s*no)\s*[:=]\s*(ORD\d{8})",
         ],
+        "triggers": ["order"],
         "category": "Custom ID",
         "pii_type": "ORDER_ID"
     },
@@ -229,6 +284,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:transaction|txn|reference|ref|trans\s*id|transaction\s*number)\s*[:=]\s*(TXN\d{8}|[A-Z]{3}\d{6})",
         ],
+        "triggers": ["trans", "txn", "ref"],
         "category": "Financial",
         "pii_type": "TRANSACTION_ID"
     },
@@ -236,6 +292,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:medical\s*record|mr\s*number|patient\s*id)\s*[:=]\s*(MR\d{6})",
         ],
+        "triggers": ["medical", "mr", "patient"],
         "category": "Medical",
         "pii_type": "MEDICAL_RECORD_ID"
     },
@@ -243,6 +300,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:insurance\s*policy|policy\s*(?:number|no)|policy\s*id)\s*[:=]\s*(IP\d{8})",
         ],
+        "triggers": ["insurance", "policy"],
         "category": "Financial",
         "pii_type": "INSURANCE_POLICY"
     },
@@ -250,6 +308,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:vehicle\s*(?:number|registration)|vehicle\s*reg|reg\s*number)\s*[:=]\s*([A-Z]{2}\d{2}\s?[A-Z]{2}\s?\d{4})",
         ],
+        "triggers": ["vehicle", "reg"],
         "category": "Government ID",
         "pii_type": "VEHICLE_REG"
     },
@@ -257,6 +316,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:tax\s*record|tax\s*(?:id|number))\s*[:=]\s*(TAX\d{7})",
         ],
+        "triggers": ["tax"],
         "category": "Government ID",
         "pii_type": "TAX_RECORD"
     },
@@ -264,6 +324,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:membership\s*(?:id|number)|member\s*id)\s*[:=]\s*(MID\d{5})",
         ],
+        "triggers": ["member"],
         "category": "Custom ID",
         "pii_type": "MEMBERSHIP_ID"
     },
@@ -271,6 +332,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:project\s*(?:code|id|number))\s*[:=]\s*(PRJ\d{4})",
         ],
+        "triggers": ["project"],
         "category": "Custom ID",
         "pii_type": "PROJECT_CODE"
     },
@@ -278,6 +340,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:referral\s*(?:code|id)|ref\s*code)\s*[:=]\s*([A-Z0-9]{6})",
         ],
+        "triggers": ["ref"],
         "category": "Custom ID",
         "pii_type": "REFERRAL_CODE"
     },
@@ -285,6 +348,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:license\s*key|license|activation\s*key)\s*[:=]\s*([A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4})",
         ],
+        "triggers": ["license", "activation"],
         "category": "Custom ID",
         "pii_type": "LICENSE_KEY"
     },
@@ -292,6 +356,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:device\s*(?:id|uuid)|device\s*number)\s*[:=]\s*([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})",
         ],
+        "triggers": ["device"],
         "category": "Technical",
         "pii_type": "DEVICE_ID"
     },
@@ -299,6 +364,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:session|token|session\s*token)\s*[:=]\s*([0-9a-f]{32})",
         ],
+        "triggers": ["session", "token"],
         "category": "Technical",
         "pii_type": "SESSION_TOKEN"
     },
@@ -308,6 +374,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:imei|imei\s*number)\s*[:=]\s*(\d{14,16})",
         ],
+        "triggers": ["imei"],
         "category": "Technical",
         "pii_type": "IMEI"
     },
@@ -315,6 +382,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:mac|mac\s*address|mac\s*id)\s*[:=]\s*([0-9A-Fa-f]{2}(?:[:\-][0-9A-Fa-f]{2}){5})",
         ],
+        "triggers": ["mac"],
         "category": "Technical",
         "pii_type": "MAC_ADDRESS"
     },
@@ -322,6 +390,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:ip|ipv4|ip\s*address)\s*[:=]\s*(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})",
         ],
+        "triggers": ["ip"],
         "category": "Technical",
         "pii_type": "IPV4"
     },
@@ -329,6 +398,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:pin(?:code)?|postal\s*code|zip\s*code)\s*[:=]\s*(\d{6})",
         ],
+        "triggers": ["pin", "postal", "zip"],
         "category": "Personal",
         "pii_type": "PINCODE"
     },
@@ -336,6 +406,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:gps|location|coordinates|latitude\s*longitude)\s*[:=]\s*((?:[6-9]|[12][0-9]|3[0-7])\.[0-9]{1,6},(?:[6-8][0-9]|9[0-7])\.[0-9]{1,6})",
         ],
+        "triggers": ["gps", "location", "coordinates", "latitude"],
         "category": "Location",
         "pii_type": "GPS"
     },
@@ -345,6 +416,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:gender|sex)\s*[:=]\s*(male|female|other|m|f|o)",
         ],
+        "triggers": ["gender", "sex"],
         "category": "Personal",
         "pii_type": "GENDER"
     },
@@ -352,6 +424,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:employer|company|organization|current\s*employer)\s*[:=]\s*([^\n,;]+)",
         ],
+        "triggers": ["employer", "company", "organization"],
         "category": "Employment",
         "pii_type": "EMPLOYER"
     },
@@ -359,6 +432,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:course|degree|program|qualification)\s*[:=]\s*((?:B\.?Tech|M\.?Tech|B\.?Sc|M\.?Sc|MBA|B\.?A|M\.?A|B\.?Com|M\.?Com)[^\n,;]*)",
         ],
+        "triggers": ["course", "degree", "program", "qualification"],
         "category": "Education",
         "pii_type": "COURSE"
     },
@@ -366,6 +440,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:year|academic\s*year|study\s*year)\s*[:=]\s*(\d{1,2})",
         ],
+        "triggers": ["year"],
         "category": "Education",
         "pii_type": "YEAR"
     },
@@ -373,6 +448,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:semester|sem)\s*[:=]\s*(\d{1,2})",
         ],
+        "triggers": ["sem"],
         "category": "Education",
         "pii_type": "SEMESTER"
     },
@@ -380,6 +456,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:guardian|parent|mother|father|guardian\s*name|parent\s*name)\s*[:=]\s*([A-Za-z\s]+)",
         ],
+        "triggers": ["guardian", "parent", "mother", "father"],
         "category": "Personal",
         "pii_type": "GUARDIAN_NAME"
     },
@@ -390,6 +467,7 @@ LABEL_PATTERNS = {
             r"//\s*merchantId\s*[:=]\s*([^\n]+)",  # Handle comments
             r"#\s*merchantId\s*[:=]\s*([^\n]+)",   # Handle Python comments
         ],
+        "triggers": ["merchant"],
         "category": "Financial",
         "pii_type": "MERCHANT_ID"
     },
@@ -397,6 +475,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:payment\s*(?:method|mode)|payment)\s*[:=]\s*(UPI|Card|Cash|Bank\s*Transfer|Credit|Debit|NetBanking|PayPal)",
         ],
+        "triggers": ["payment"],
         "category": "Financial",
         "pii_type": "PAYMENT_METHOD"
     },
@@ -404,6 +483,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:receipt\s*(?:number|no)|receipt\s*id)\s*[:=]\s*(RCP-\d{5}|\d{6,})",
         ],
+        "triggers": ["receipt"],
         "category": "Financial",
         "pii_type": "RECEIPT_NUMBER"
     },
@@ -411,6 +491,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:invoice\s*(?:number|no)|invoice\s*id|inv)\s*[:=]\s*(INV-\d{5}|\d{6,})",
         ],
+        "triggers": ["inv"],
         "category": "Financial",
         "pii_type": "INVOICE_NUMBER"
     },
@@ -418,6 +499,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:statement\s*(?:period|date)|statement\s*from)\s*[:=]\s*(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}\s*(?:to|to)\s*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})",
         ],
+        "triggers": ["statement"],
         "category": "Financial",
         "pii_type": "STATEMENT_PERIOD"
     },
@@ -425,6 +507,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:account\s*holder|account\s*name)\s*[:=]\s*([A-Za-z\s]+)",
         ],
+        "triggers": ["account"],
         "category": "Financial",
         "pii_type": "ACCOUNT_HOLDER"
     },
@@ -434,6 +517,7 @@ LABEL_PATTERNS = {
             r"//\s*Developer\s*[:=]\s*([^\n]+)",  # Handle comments
             r"#\s*Developer\s*[:=]\s*([^\n]+)",   # Handle Python comments
         ],
+        "triggers": ["developer", "author", "created"],
         "category": "Employment",
         "pii_type": "DEVELOPER"
     },
@@ -441,6 +525,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:contact|contact\s*person|contact\s*name)\s*[:=]\s*([A-Za-z\s]+)",
         ],
+        "triggers": ["contact"],
         "category": "Personal",
         "pii_type": "CONTACT"
     },
@@ -448,6 +533,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:last\s*(?:updated|modified)|updated|modified)\s*[:=]\s*(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})",
         ],
+        "triggers": ["updated", "modified"],
         "category": "Metadata",
         "pii_type": "LAST_UPDATED"
     },
@@ -455,6 +541,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:version|ver|v)\s*[:=]\s*([\d.]+)",
         ],
+        "triggers": ["v"],
         "category": "Metadata",
         "pii_type": "VERSION"
     },
@@ -462,6 +549,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:app\s*name|application\s*name|appname)\s*[:=]\s*([^\n,;]+)",
         ],
+        "triggers": ["app"],
         "category": "Metadata",
         "pii_type": "APP_NAME"
     },
@@ -469,6 +557,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:time|timestamp)\s*[:=]\s*(\d{1,2}:\d{2}:\d{2})",
         ],
+        "triggers": ["time"],
         "category": "Metadata",
         "pii_type": "TIME"
     },
@@ -476,6 +565,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:amount|total|grand\s*total|balance)\s*[:=]\s*(?:₹|Rs\.?)?(\d{1,3}(?:,\d{2,3})*(?:\.\d{2})?)",
         ],
+        "triggers": ["amount", "total", "balance"],
         "category": "Financial",
         "pii_type": "AMOUNT"
     },
@@ -483,6 +573,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:gst|tax|goods\s*and\s*service\s*tax)\s*[:=]\s*(?:₹|Rs\.?)?(\d{1,3}(?:,\d{2,3})*(?:\.\d{2})?)",
         ],
+        "triggers": ["gst", "tax", "goods"],
         "category": "Financial",
         "pii_type": "GST"
     },
@@ -490,6 +581,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:debit|credit|transaction\s*type)\s*[:=]\s*(Debit|Credit)",
         ],
+        "triggers": ["debit", "credit", "transaction"],
         "category": "Financial",
         "pii_type": "DEBIT_CREDIT"
     },
@@ -497,6 +589,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:linked\s*mobile|registered\s*mobile|mobile\s*number)\s*[:=]\s*(\+?91[\s\-]?[6-9]\d{3}[\s\-]?\d{5}|\d{10,12})",
         ],
+        "triggers": ["mobile"],
         "category": "Contact",
         "pii_type": "LINKED_MOBILE"
     },
@@ -504,6 +597,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:support\s*phone|support\s*(?:number|contact)|helpline)\s*[:=]\s*(\+?91[\s\-]?[6-9]\d{3}[\s\-]?\d{5}|\d{10,12})",
         ],
+        "triggers": ["support", "helpline"],
         "category": "Contact",
         "pii_type": "SUPPORT_PHONE"
     },
@@ -513,6 +607,7 @@ LABEL_PATTERNS = {
             r"//\s*(?:Contact|Admin\s*Email)\s*[:=]\s*([a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})",  # Handle comments
             r"#\s*(?:Contact|Admin\s*Email)\s*[:=]\s*([a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})",   # Handle Python comments
         ],
+        "triggers": ["admin", "contact"],
         "category": "Contact",
         "pii_type": "ADMIN_EMAIL"
     },
@@ -520,6 +615,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:emergency\s*(?:contact|number|phone))\s*[:=]\s*(\+?91[\s\-]?[6-9]\d{3}[\s\-]?\d{5}|\d{10,12})",
         ],
+        "triggers": ["emergency"],
         "category": "Contact",
         "pii_type": "EMERGENCY_CONTACT"
     },
@@ -527,6 +623,7 @@ LABEL_PATTERNS = {
         "patterns": [
             r"(?:account\s*number|a/c|account|acct)\s*[:=]\s*(\d{10,18})",
         ],
+        "triggers": ["account", "a/c", "acct"],
         "category": "Financial",
         "pii_type": "ACCOUNT_NUMBER"
     },
@@ -552,6 +649,19 @@ class LabelBasedPIIDetector:
         self.label_patterns = {}
         self.pattern_count = 0
         self._compile_patterns()
+        # Flat (label_type, category, label, ((pattern, lowered pattern, re2 pattern,
+        # value group), ...)) rows for the detect loop
+        self._label_rows = tuple(
+            (label_type, config['category'], label_type.replace('_', ' '), tuple(
+                (pattern, lowered, re2_pattern, 1 if pattern.groups else 0)
+                for pattern, lowered, re2_pattern in zip(
+                    config['patterns'], config['lowered_patterns'], config['re2_patterns']
+                )
+            ))
+            for label_type, config in self.label_patterns.items()
+        )
+        self.trigger_automaton = self._compile_triggers()
+        self._detect_cached = lru_cache(maxsize=_DETECT_CACHE_SIZE)(self._detect_rows_tuple)
         logger.info(f"✓ Label-Based Detector ready ({self.pattern_count} patterns, pre-compiled)")
     
     def _compile_patterns(self):
@@ -568,10 +678,74 @@ class LabelBasedPIIDetector:
             
             self.label_patterns[label_type] = {
                 'patterns': compiled_patterns,
+                'lowered_patterns': [self._compile_lowered(p) for p in config['patterns']],
+                're2_patterns': [self._compile_re2(p) for p in config['patterns']],
+                'triggers': tuple(config['triggers']),
                 'category': config['category'],
                 'pii_type': config['pii_type']
             }
     
+    @staticmethod
+    def _compile_lowered(pattern: str):
+        """
+        Case-sensitive, lowercased copy of a pattern for lowercased ASCII
+        text, None when lowercasing would change an escape such as \\S
+        
+        On ASCII text it matches exactly where the IGNORECASE pattern
+        matches on the original, about six times faster: re does no case
+        folding per character and can use its literal-prefix search.
+        """
+        if re.search(r'\\[A-Z]', pattern):
+            return None
+        return re.compile(pattern.lower(), re.MULTILINE | re.DOTALL)
+    
+    @staticmethod
+    def _compile_re2(pattern: str):
+        """RE2 copy of a pattern, None when RE2 is missing or rejects it"""
+        if re2 is None:
+            return None
+        try:
+            return re2.compile('(?ims)' + pattern)
+        except re2.error:
+            return None
+    
+    def _compile_triggers(self):
+        """
+        Build an Aho-Corasick automaton mapping each trigger keyword to the
+        label types it triggers
+        
+        Returns:
+            ahocorasick.Automaton or None when pyahocorasick is missing
+        """
+        if ahocorasick is None:
+            return None
+        
+        keyword_labels = {}
+        for label_type, config in LABEL_PATTERNS.items():
+            for keyword in config['triggers']:
+                keyword_labels.setdefault(keyword, []).append(label_type)
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, labels in keyword_labels.items():
+            automaton.add_word(keyword, tuple(labels))
+        automaton.make_automaton()
+        return automaton
+    
+    def _candidate_labels(self, text: str) -> Optional[Set[str]]:
+        """Return the label types whose keywords occur in text, or None to run all"""
+        folded = text.translate(_IGNORECASE_FOLD).lower()
+        if self.trigger_automaton is None:
+            # Without pyahocorasick: one substring search per keyword, each
+            # a fast C scan that stops at the first hit
+            return {
+                label_type for label_type, config in self.label_patterns.items()
+                if any(keyword in folded for keyword in config['triggers'])
+            }
+        candidates = set()
+        for _, labels in self.trigger_automaton.iter(folded):
+            candidates.update(labels)
+        return candidates
+    
     def detect_by_labels(self, text: str) -> List[Dict]:
         """
         OPTIMIZED: Detect PII by finding labels FIRST, then extracting values
@@ -589,58 +763,168 @@ class LabelBasedPIIDetector:
         Returns:
             List of detected PII with label-based categorization
         """
-        # Fast exit for empty/short text
-        if not text or len(text.strip()) < 2:
+        # Fast exit for empty/short text, or text without the ':' or '='
+        # every label pattern needs after its label
+        if not text or len(text.strip()) < 2 or (':' not in text and '=' not in text):
             return []
+        if len(text) > _DETECT_CACHE_MAX_TEXT:
+            return self._detect_impl(text)
+        # Cached rows are immutable; callers get fresh dicts they may modify
+        return self._row_dicts(self._detect_cached(text))
+    
+    def clear_cache(self):
+        """Drop memoized detect_by_labels results"""
+        self._detect_cached.cache_clear()
+    
+    def _detect_impl(self, text: str) -> List[Dict]:
+        """detect_by_labels without the cache"""
+        return self._row_dicts(self._detect_rows(text))
+    
+    def _detect_rows_tuple(self, text: str) -> Tuple[Tuple, ...]:
+        """Cacheable form of _detect_rows"""
+        return tuple(self._detect_rows(text))
+    
+    @staticmethod
+    def _row_dicts(rows) -> List[Dict]:
+        """Detection dicts for _detect_rows' tuples"""
+        return [
+            {
+                'type': label_type,
+                'category': category,
+                'label': label,
+                'value': value,
+                'confidence': confidence,
+                'start': start,
+                'end': end,
+                'source': 'LABEL_BASED'
+            }
+            for start, end, label_type, category, label, value, confidence in rows
+        ]
+    
+    def _detect_rows(self, text: str) -> List[Tuple]:
+        """
+        Label detections as (start, end, label_type, category, label, value,
+        confidence) tuples in position order
         
+        Tuples are only turned into dicts once the caller needs them, and
+        take about a third of the memory of a detection dict in the cache
+        """
         detections = []
         seen_values: Set[Tuple[str, str]] = set()  # Fast O(1) duplicate check
+        # One keyword pass picks the label types worth running finditer for
+        candidate_labels = self._candidate_labels(text)
+        # On plain ASCII text an RE2 search finds each pattern's first match
+        # faster than re, skipping patterns that never match; re then matches
+        # from there on, as RE2's per-match overhead in Python is higher
+        use_re2 = re2 is not None and not _RE2_UNSAFE_CHARS.search(text)
+        # ASCII text is matched lowercased with the lowered patterns;
+        # lowercasing ASCII keeps every offset, so values come from text
+        ascii_text = text.isascii()
+        lowered_text = text.lower() if ascii_text else text
+        
+        # Bound once: the inner loop runs per match
+        append = detections.append
+        seen_add = seen_values.add
         
         # OPTIMIZED: Iterate label types (fewer iterations = faster)
-        for label_type, config in self.label_patterns.items():
-            config_category = config['category']  # Cache lookup
-            config_pii_type = config['pii_type']   # Cache lookup
+        for label_type, category, label, patterns in self._label_rows:
+            if candidate_labels is not None and label_type not in candidate_labels:
+                continue
             
             # Process all patterns for this label type
-            for pattern in config['patterns']:
+            for pattern, lowered, re2_pattern, value_group in patterns:
+                start = 0
+                if use_re2 and re2_pattern is not None:
+                    first = re2_pattern.search(text)
+                    if first is None:
+                        continue
+                    # No pattern looks behind, so matching from here is the same
+                    start = first.start()
+                
                 # finditer is single-pass and memory efficient
-                for match in pattern.finditer(text):
-                    try:
-                        # Fast value extraction
-                        pii_value = (match.group(1) if match.groups() else match.group(0)).strip()
-                        
-                        # Fast length check (skip invalids)
-                        if len(pii_value) < 2:
-                            continue
-                        
-                        # Fast duplicate detection
-                        value_key = (label_type, pii_value.lower())
-                        if value_key in seen_values:
-                            continue
-                        seen_values.add(value_key)
-                        
-                        # Pre-formatted detection (no .replace() overhead)
-                        detection = {
-                            'type': label_type,
-                            'category': config_category,
-                            'label': label_type.replace('_', ' '),
-                            'value': pii_value,
-                            'confidence': 0.95,
-                            'start': match.start(),
-                            'end': match.end(),
-                            'source': 'LABEL_BASED'
-                        }
-                        
-                        detections.append(detection)
-                    except (IndexError, AttributeError):
-                        # Skip malformed matches
+                if ascii_text and lowered is not None:
+                    matches = lowered.finditer(lowered_text, start)
+                else:
+                    matches = pattern.finditer(text, start)
+                for match in matches:
+                    value_start, value_end = match.span(value_group)
+                    if value_start < 0:
+                        continue
+                    pii_value = text[value_start:value_end].strip()
+                    
+                    # Fast length check (skip invalids)
+                    if len(pii_value) < 2:
                         continue
+                    
+                    # Fast duplicate detection
+                    value_key = (label_type, pii_value.lower())
+                    if value_key in seen_values:
+                        continue
+                    seen_add(value_key)
+                    
+                    match_start, match_end = match.span()
+                    append((match_start, match_end, label_type, category, label, pii_value, 0.95))
+        
+        self._validate_aadhaar(detections)
         
-        # Sort by position (O(n log n), unavoidable)
-        detections.sort(key=lambda x: x['start'])
+        # Sort by position (stable, so ties keep label and pattern order)
+        detections.sort(key=itemgetter(0))
         
         return detections
     
+    def detect_and_categorize(self, text: str) -> Tuple[List[Dict], Dict]:
+        """
+        Detect PII and build the category view in the same call
+        
+        Equivalent to categorize_by_label(detect_by_labels(text)), with the
+        category dict filled in one loop over the position-sorted detections
+        
+        Args:
+            text: Document text
+            
+        Returns:
+            tuple: (detections, category -> label -> values)
+        """
+        detections = self.detect_by_labels(text)
+        categorized = {}
+        labels = {}  # (category, label) -> value list, skips the nested lookups
+        
+        for detection in detections:
+            key = (detection['category'], detection['label'])
+            values = labels.get(key)
+            if values is None:
+                values = labels[key] = []
+                categorized.setdefault(key[0], {})[key[1]] = values
+            values.append({
+                'value': detection['value'],
+                'confidence': detection['confidence']
+            })
+        
+        return detections, categorized
+    
+    @staticmethod
+    def _validate_aadhaar(rows: List[Tuple]):
+        """
+        Checksum all Aadhaar detection rows in one vectorized Verhoeff pass
+        Numbers failing the checksum are kept with reduced confidence
+        """
+        aadhaar = []
+        digit_strings = []
+        for i, row in enumerate(rows):
+            if row[2] == 'AADHAAR':
+                digits = ''.join(c for c in row[5] if c.isdigit())
+                if len(digits) == 12:
+                    aadhaar.append(i)
+                    digit_strings.append(digits)
+        
+        if not aadhaar:
+            return
+        
+        valid = verhoeff_check_batch(aadhaar_digit_matrix(digit_strings))
+        for i, ok in zip(aadhaar, valid):
+            if not ok:
+                rows[i] = rows[i][:6] + (0.7,)
+    
     def categorize_by_label(self, detections: List[Dict]) -> Dict:
         """
         Organize detections by category and label
@@ -5,10 +5,10 @@ Uses advanced PII detector with 40+ patterns
 """
 
 import logging
-from typing import List, Dict
+from typing import List, Dict, BinaryIO, Union
 import PyPDF2
 import pdfplumber
-from pii_detector import pii_detector  # Use advanced detector with ALL patterns
+from pii_detector import get_detector  # Use advanced detector with ALL patterns
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +20,12 @@ class PDFPIIDetector:
         # No need to initialize - just extract and return text
         pass
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def extract_text_from_pdf(self, pdf_path: Union[str, BinaryIO]) -> str:
         """
         Extract text from PDF file with multiple methods for robustness
         
         Args:
-            pdf_path: Path to PDF file
+            pdf_path: Path to PDF file, or a seekable binary file object
             
         Returns:
             str: Extracted text
@@ -46,20 +46,31 @@ class PDFPIIDetector:
             
             try:
                 # Fallback to PyPDF2
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += f"\n--- Page {page_num + 1} ---\n"
-                            text += page_text
-                            text += "\n"
+                if isinstance(pdf_path, str):
+                    with open(pdf_path, 'rb') as file:
+                        text += self._extract_with_pypdf2(file)
+                else:
+                    pdf_path.seek(0)
+                    text += self._extract_with_pypdf2(pdf_path)
             except Exception as e:
                 logger.error(f"Failed to extract text from PDF: {e}")
                 return ""
         
         return text
     
+    @staticmethod
+    def _extract_with_pypdf2(file: BinaryIO) -> str:
+        """Extract text page by page with PyPDF2"""
+        text = ""
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page_num, page in enumerate(pdf_reader.pages):
+            page_text = page.extract_text()
+            if page_text:
+                text += f"\n--- Page {page_num + 1} ---\n"
+                text += page_text
+                text += "\n"
+        return text
+    
     def detect_pii_in_pdf(self, pdf_path: str) -> Dict:
         """
         Detect PII in PDF file using ADVANCED detector (40+ patterns)
@@ -83,7 +94,7 @@ class PDFPIIDetector:
             
             # Use ADVANCED detector with all patterns (Username, Password, API Keys, etc.)
             logger.info(f"Scanning PDF with advanced detector (40+ patterns)...")
-            detections = pii_detector.scan_text(text)
+            detections = get_detector().scan_text(text)
             
             # Convert to standard format with page info
             formatted_detections = []
@@ -141,7 +152,7 @@ class PDFPIIDetector:
                     
                     if page_text:
                         # Use ADVANCED detector
-                        detections = pii_detector.scan_text(page_text)
+                        detections = get_detector().scan_text(page_text)
                         
                         # Format detections
                         formatted_detections = []
@@ -5,8 +5,10 @@ Uses advanced PII detector with 40+ patterns
 """
 
 import logging
-from typing import List, Dict
-from pii_detector import pii_detector  # Use advanced detector with ALL patterns
+import mmap
+import os
+from typing import List, Dict, BinaryIO, Union
+from pii_detector import get_detector  # Use advanced detector with ALL patterns
 
 logger = logging.getLogger(__name__)
 
@@ -18,32 +20,46 @@ class TXTPIIDetector:
         # No need to initialize - just extract and return text
         pass
     
-    def extract_text_from_txt(self, txt_path: str, encoding: str = 'utf-8') -> str:
+    def extract_text_from_txt(self, txt_path: Union[str, BinaryIO], encoding: str = 'utf-8') -> str:
         """
         Extract text from TXT file
         
         Args:
-            txt_path: Path to TXT file
+            txt_path: Path to TXT file, or a binary file object
             encoding: Text encoding (default: utf-8)
             
         Returns:
             str: File content
         """
         try:
-            with open(txt_path, 'r', encoding=encoding) as f:
-                return f.read()
-        except UnicodeDecodeError:
-            # Try with different encoding
-            try:
-                with open(txt_path, 'r', encoding='latin-1') as f:
-                    return f.read()
-            except Exception as e:
-                logger.error(f"Failed to read TXT file with different encodings: {e}")
-                return ""
+            if isinstance(txt_path, str):
+                # Decode straight from a read-only mapping of the file, so the
+                # raw bytes are never copied into the heap before decoding
+                with open(txt_path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        return ""
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        text = self._decode(mapped, encoding)
+            else:
+                data = txt_path.getbuffer() if hasattr(txt_path, 'getbuffer') else txt_path.read()
+                text = self._decode(data, encoding)
+            # Match text-mode reads: universal newlines
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
         except Exception as e:
             logger.error(f"Failed to extract text from TXT: {e}")
             return ""
     
+    @staticmethod
+    def _decode(data, encoding: str) -> str:
+        """Decode raw file bytes, falling back to latin-1"""
+        try:
+            return str(data, encoding)
+        except UnicodeDecodeError:
+            # Try with different encoding
+            return str(data, 'latin-1')
+    
     def detect_pii_in_txt(self, txt_path: str) -> Dict:
         """
         Detect PII in TXT file using ADVANCED detector (40+ patterns)
@@ -67,7 +83,7 @@ class TXTPIIDetector:
             
             # Use ADVANCED detector with all patterns
             logger.info(f"Scanning TXT with advanced detector (40+ patterns)...")
-            detections = pii_detector.scan_text(text)
+            detections = get_detector().scan_text(text)
             
             # Format detections
             formatted_detections = []
@@ -0,0 +1,133 @@
+"""
+Payment service tests.
+"""
+import hashlib
+import hmac
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from payments import invoice_service
+from payments.invoice_service import InvoiceService
+from payments.razorpay_service import RazorpayService, RazorpayNotConfigured
+
+
+class TestRazorpayService(unittest.TestCase):
+    """Test Razorpay wrapper without hitting the SDK."""
+
+    def setUp(self):
+        """Create a service with a stand-in client."""
+        self.service = RazorpayService('rzp_test_key', 'test_secret')
+        self.service._client = object()
+
+    def _sign(self, order_id, payment_id):
+        message = f"{order_id}|{payment_id}".encode('utf-8')
+        return hmac.new(b'test_secret', message, hashlib.sha256).hexdigest()
+
+    def test_valid_signature(self):
+        """Test a correctly signed payment is accepted."""
+        signature = self._sign('order_1', 'pay_1')
+        self.assertTrue(self.service.verify_payment_signature('order_1', 'pay_1', signature))
+
+    def test_invalid_signature(self):
+        """Test tampered ids and signatures are rejected."""
+        signature = self._sign('order_1', 'pay_1')
+        self.assertFalse(self.service.verify_payment_signature('order_1', 'pay_2', signature))
+        self.assertFalse(self.service.verify_payment_signature('order_1', 'pay_1', 'bad'))
+        self.assertFalse(self.service.verify_payment_signature('order_1', 'pay_1', None))
+
+    def test_not_configured(self):
+        """Test verification requires credentials."""
+        service = RazorpayService(None, None)
+        self.assertFalse(service.enabled)
+        with self.assertRaises(RazorpayNotConfigured):
+            service.verify_payment_signature('order_1', 'pay_1', 'sig')
+
+
+class TestInvoiceService(unittest.TestCase):
+    """Test invoice PDF generation."""
+
+    def setUp(self):
+        """Create a service writing into a temporary directory."""
+        try:
+            import reportlab  # noqa: F401
+        except ImportError:
+            self.skipTest("reportlab not installed")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.service = InvoiceService(self.tmpdir.name)
+        self.payload = {
+            'transaction_id': 'txn_1',
+            'timestamp': '2024-01-01 00:00:00 UTC',
+            'user': {'email': 'user@example.com'},
+            'amount_inr': 999,
+        }
+
+    def tearDown(self):
+        """Stop the writer threads and remove generated files."""
+        self.service.close()
+        self.tmpdir.cleanup()
+
+    def test_generate_writes_pdf(self):
+        """Test the invoice is written once wait_for returns."""
+        path = self.service.wait_for(self.service.generate(self.payload))
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(5), b'%PDF-')
+
+    def test_generate_to_stream(self):
+        """Test rendering into a stream matches the stored PDF."""
+        stream = io.BytesIO()
+        self.service.generate_to_stream(self.payload, stream)
+        self.assertTrue(stream.getvalue().startswith(b'%PDF-'))
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_output_is_reproducible(self):
+        """Test the same payload renders to identical bytes."""
+        first, second = io.BytesIO(), io.BytesIO()
+        self.service.generate_to_stream(self.payload, first)
+        self.service.generate_to_stream(self.payload, second)
+        self.assertEqual(first.getvalue(), second.getvalue())
+
+    def test_identical_payloads_share_storage(self):
+        """Test regenerated invoices link to the same rendered PDF."""
+        first = self.service.wait_for(self.service.generate(self.payload))
+        again = self.service.wait_for(self.service.generate(dict(self.payload)))
+        other = self.service.wait_for(self.service.generate(dict(self.payload, transaction_id='txn_2')))
+
+        self.assertEqual(first, again)
+        self.assertEqual(os.stat(first).st_nlink, 2)
+        self.assertNotEqual(os.stat(first).st_ino, os.stat(other).st_ino)
+        self.assertEqual(len([f for f in os.listdir(self.tmpdir.name) if f.endswith('.tmp')]), 0)
+
+    def test_wait_for_reraises_render_error(self):
+        """Test a failed render is re-raised, then evicted after its TTL."""
+        with patch.object(self.service, '_render_pdf', side_effect=ValueError("bad payload")):
+            path = self.service.generate(self.payload)
+            with self.assertRaisesRegex(ValueError, "bad payload"):
+                self.service.wait_for(path)
+        with self.assertRaises(ValueError):
+            self.service.wait_for(path)
+
+        later = invoice_service.time.monotonic() + invoice_service.FAILED_INVOICE_TTL + 1
+        with patch.object(invoice_service.time, 'monotonic', return_value=later):
+            self.service.generate(dict(self.payload, transaction_id='txn_2'))
+            self.service.close()
+        self.assertEqual(self.service._pending, {})
+        self.assertEqual(self.service._failed, {})
+
+    def test_context_manager_closes_pool(self):
+        """Test leaving the with block writes queued invoices and stops the pool."""
+        with InvoiceService(self.tmpdir.name) as service:
+            path = service.generate(self.payload)
+        self.assertTrue(os.path.exists(path))
+        with self.assertRaises(RuntimeError):
+            service.generate(self.payload)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Unit tests for PII deduplication pipeline.
+"""
+import unittest
+from unittest.mock import patch
+
+import pii_deduplicator
+from pii_deduplicator import deduplicate_piis, smart_pii_deduplication
+
+
+class TestDeduplicatePiis(unittest.TestCase):
+    """Test display deduplication."""
+
+    def test_occurrence_counts(self):
+        """Duplicates are folded into the first display entry."""
+        matches = [
+            {'type': 'AADHAAR', 'value': '1234 5678 9012', 'confidence': 0.9},
+            {'type': 'PHONE', 'value': '+91 98765 43210', 'confidence': 0.9},
+            {'type': 'aadhaar', 'value': '1234-5678-9012', 'confidence': 0.8},
+            {'type': 'PHONE', 'value': '9876543210', 'confidence': 0.9},
+            {'type': 'AADHAAR', 'value': '123456789012', 'confidence': 0.9},
+        ]
+
+        display, masking = deduplicate_piis(matches)
+
+        self.assertEqual(len(masking), 5)
+        self.assertEqual(len(display), 2)
+        self.assertEqual(display[0]['value'], '1234 5678 9012')
+        self.assertEqual(display[0]['occurrence_count'], 3)
+        self.assertTrue(display[0]['is_deduplicated'])
+        self.assertEqual(display[1]['occurrence_count'], 2)
+
+    def test_unique_values_untouched(self):
+        """Unique values keep a count of one and do not mutate input."""
+        matches = [
+            {'type': 'EMAIL', 'value': 'a@example.com'},
+            {'type': 'EMAIL', 'value': 'b@example.com'},
+        ]
+
+        display, _ = deduplicate_piis(matches)
+
+        self.assertEqual([p['occurrence_count'] for p in display], [1, 1])
+        self.assertFalse(any(p['is_deduplicated'] for p in display))
+        self.assertNotIn('occurrence_count', matches[0])
+
+    def test_vectorized_matches_loop(self):
+        """The pandas fast path groups exactly like the Python loop."""
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            self.skipTest("pandas not installed")
+
+        values = ['1234 5678 9012', '+91 98765-43210', '9876543210',
+                  'A@B.com', 'a@b.com', 'x_y z', '91987654321', '']
+        types = ['AADHAAR', 'phone', 'EMAIL', 'upi', 'PAN']
+        matches = [
+            {'type': types[i % len(types)], 'value': values[i % len(values)], 'i': i}
+            for i in range(600)
+        ]
+
+        with patch.object(pii_deduplicator, 'VECTORIZE_THRESHOLD', len(matches) + 1):
+            expected, _ = deduplicate_piis(matches)
+        with patch.object(pii_deduplicator, 'VECTORIZE_THRESHOLD', 0):
+            actual, _ = deduplicate_piis(matches)
+
+        self.assertEqual(actual, expected)
+
+
+class TestSmartPiiDeduplication(unittest.TestCase):
+    """Test the full deduplication pipeline."""
+
+    def test_pipeline(self):
+        """Low-confidence and substring matches are dropped."""
+        matches = [
+            {'type': 'AADHAAR', 'value': '1234 5678 9012', 'confidence': 0.9},
+            {'type': 'AADHAAR', 'value': '5678 9012', 'confidence': 0.8},
+            {'type': 'AADHAAR', 'value': '123456789012', 'confidence': 0.9},
+            {'type': 'EMAIL', 'value': 'x@example.com', 'confidence': 0.5},
+        ]
+
+        display, masking = smart_pii_deduplication(matches)
+
+        self.assertEqual(len(display), 1)
+        self.assertEqual(display[0]['occurrence_count'], 2)
+        self.assertEqual(len(masking), 2)
+
+    def test_substring_index_size_guard(self):
+        """Groups with many value lengths use the scan, with the same result."""
+        many_lengths = [
+            {'type': 'EMAIL', 'value': 'a' * n + '@example.com', 'confidence': 0.9}
+            for n in range(1, 200)
+        ]
+        few_lengths = [
+            {'type': 'AADHAAR', 'value': '1234 5678 9012', 'confidence': 0.9},
+            {'type': 'AADHAAR', 'value': '5678 9012', 'confidence': 0.8},
+            {'type': 'AADHAAR', 'value': '9012', 'confidence': 0.8},
+        ]
+
+        with patch.object(pii_deduplicator, '_keep_by_substring_index',
+                          side_effect=AssertionError("index built")):
+            kept = pii_deduplicator.remove_substring_duplicates(many_lengths)
+        self.assertEqual(kept, many_lengths[-1:])
+
+        expected = pii_deduplicator.remove_substring_duplicates(few_lengths)
+        with patch.object(pii_deduplicator, 'SUBSTRING_INDEX_MAX_LENGTHS', 0):
+            self.assertEqual(pii_deduplicator.remove_substring_duplicates(few_lengths), expected)
+        self.assertEqual(expected, few_lengths[:1])
+
+    def test_trivial_inputs(self):
+        """Empty and single-item inputs take the fast path."""
+        self.assertEqual(smart_pii_deduplication([]), ([], []))
+
+        pii = {'type': 'PAN', 'value': 'ABCDE1234F', 'confidence': 0.9}
+        display, masking = smart_pii_deduplication([pii])
+        self.assertEqual(display, [dict(pii, occurrence_count=1, is_deduplicated=False)])
+        self.assertEqual(masking, [pii])
+
+        low = {'type': 'PAN', 'value': 'ABCDE1234F', 'confidence': 0.1}
+        self.assertEqual(smart_pii_deduplication([low]), ([], []))
+
+    def test_no_temporary_keys_leak(self):
+        """Cached normalization keys are stripped from all outputs."""
+        matches = [
+            {'type': 'PHONE', 'value': '9876543210', 'confidence': 0.9},
+            {'type': 'PHONE', 'value': '98765 43210', 'confidence': 0.9},
+        ]
+
+        display, masking = smart_pii_deduplication(matches)
+
+        for pii in display + masking + matches:
+            self.assertNotIn('_norm', pii)
+            self.assertNotIn('_type_u', pii)
+
+
+if __name__ == '__main__':
+    unittest.main()
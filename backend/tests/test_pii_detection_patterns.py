@@ -0,0 +1,91 @@
+"""
+Unit tests for the generic regex-based PII detector.
+"""
+import unittest
+from pii_detection_patterns import PIIDetector
+
+SAMPLE_TEXT = (
+    "Name: Rahul Sharma\n"
+    "Email: rahul.sharma@example.com\n"
+    "PAN ABCDE1234F, Aadhaar 2345 6789 0123\n"
+    "Phone: +91 98765 43210\n"
+    "IFSC HDFC0001234, UPI rahul@paytm\n"
+    "password: s3cr3t!pass\n"
+)
+
+
+class TestPIIDetector(unittest.TestCase):
+    """Test pattern-based PII detection."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.detector = PIIDetector()
+
+    def test_detects_common_types(self):
+        """Test common PII types are found in order of position."""
+        detections = self.detector.detect(SAMPLE_TEXT)
+        types = {d['type'] for d in detections}
+
+        for expected in ('Name', 'Email', 'PAN', 'Aadhaar', 'IFSC', 'UPIID', 'Password'):
+            self.assertIn(expected, types)
+
+        positions = [d['start_pos'] for d in detections]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_email_tld_is_letters_only(self):
+        """Test a pipe in the top-level domain is not accepted."""
+        emails = [d['value'] for d in self.detector.detect("mail user@host.c|m or ops@host.co")]
+        self.assertEqual(emails, ['ops@host.co'])
+
+    def test_password_charset(self):
+        """Test password values keep punctuation and stop at excluded characters."""
+        detections = self.detector.detect("pwd: 'Ab(1)-=x/y' and password: abc|def")
+        values = [d['value'] for d in detections if d['type'] == 'Password']
+        self.assertEqual(values, ["pwd: 'Ab(1)-=x/y'"])
+
+    def test_no_pii(self):
+        """Test text without PII yields no detections."""
+        self.assertEqual(self.detector.detect("nothing to see here"), [])
+
+    def test_prefilter_matches_full_scan(self):
+        """Test the multi-pattern prefilter does not change results."""
+        # NBSP, \x0b and \x1c are \s to re but not to RE2, so such text skips RE2
+        texts = (
+            SAMPLE_TEXT,
+            "My aadhaar 1234\xa05678\xa09012 here",
+            "password:\xa0abc123!x",
+            "Aadhaar 2345\x0b6789\x0b0123, pwd:\x1cs3cr3t",
+        )
+        expected = [self.detector.detect(text) for text in texts]
+
+        self.detector.pattern_set = None
+        self.assertEqual([self.detector.detect(text) for text in texts], expected)
+        self.assertEqual({d['type'] for d in expected[1]}, {'Aadhaar'})
+        self.assertEqual({d['type'] for d in expected[2]}, {'Password'})
+
+    def test_keyword_prefilter_matches_full_scan(self):
+        """Test the trigger keyword prefilter does not change results."""
+        if self.detector.trigger_automaton is None:
+            self.skipTest("pyahocorasick not installed")
+        self.detector.pattern_set = None
+        expected = self.detector.detect(SAMPLE_TEXT.upper())
+
+        self.detector.trigger_automaton = None
+        self.assertEqual(self.detector.detect(SAMPLE_TEXT.upper()), expected)
+
+    def test_digit_runs_match_full_scan(self):
+        """Test classifying digit runs finds the same numbers as a text scan."""
+        text = (
+            "card 4111 1111 1111 1111, aadhaar 2345-6789-0123 / 2345 6789 0123\n"
+            "ids 1234 5678 9012 3456 7890 1234 and 123456789012a 9876-5432-1098-7654"
+        )
+        expected_types = {'Aadhaar', 'CreditCard'}
+        detections = self.detector.detect(text)
+        self.assertEqual({d['type'] for d in detections}, expected_types)
+
+        self.detector.digit_run_types = ()
+        self.assertEqual(self.detector.detect(text), detections)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+"""
+Unit tests for the context-aware PII detector.
+"""
+import unittest
+
+from pii_detector_advanced import ContextAwarePIIDetector
+
+
+class TestContextBoost(unittest.TestCase):
+    """Test context keyword detection around matches."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.detector = ContextAwarePIIDetector()
+
+    def _context(self, text, pii_type):
+        return [r['context'] for r in self.detector.scan_text_advanced(text) if r['type'] == pii_type]
+
+    def test_keyword_nearby(self):
+        """Test a keyword within 100 characters flags the match."""
+        self.assertEqual(self._context("Employee EMP1234", 'EMPLOYEE_ID'), [True])
+        self.assertEqual(self._context("EMP1234" + " x" * 60 + " employee", 'EMPLOYEE_ID'), [False])
+
+    def test_partial_word_at_window_edge(self):
+        """Test a keyword cut by the context window does not count."""
+        text = "EMP1234" + " " * 97 + "employee"  # window ends after "emp"
+        self.assertEqual(self._context(text, 'EMPLOYEE_ID'), [False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Unit tests for DOCX text extraction.
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+
+import pii_detector_docx
+from pii_detection_patterns import pii_detector
+from pii_detector_docx import DOCXPIIDetector
+
+
+def _sample_docx():
+    """Build a DOCX with breaks, blank paragraphs, merged cells and sections."""
+    doc = Document()
+    doc.add_paragraph("PAN ABCDE1234F")
+    doc.add_paragraph("   ")
+    run = doc.add_paragraph("phone").add_run("9876543210")
+    run.add_break()
+    run.add_break(WD_BREAK.PAGE)
+    run.add_text("tab\there")
+
+    table = doc.add_table(rows=3, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"r{r}c{c}"
+    table.cell(0, 0).merge(table.cell(1, 1))
+    table.cell(2, 2).add_paragraph("4991 1866 5246")
+
+    doc.add_section()
+    doc.add_paragraph("mail a.b@example.com")
+
+    stream = io.BytesIO()
+    doc.save(stream)
+    return stream.getvalue()
+
+
+class TestExtractText(unittest.TestCase):
+    """Test the streaming parser against python-docx."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.detector = DOCXPIIDetector()
+        self.data = _sample_docx()
+
+    def test_matches_python_docx(self):
+        """Test text and structure match the Document-based extraction."""
+        doc = Document(io.BytesIO(self.data))
+        expected = "".join(p.text + "\n" for p in doc.paragraphs if p.text.strip())
+        for table in doc.tables:
+            expected += "\n--- TABLE ---\n"
+            for row in table.rows:
+                expected += " | ".join(cell.text for cell in row.cells) + "\n"
+
+        text, structure = self.detector._parse_docx(io.BytesIO(self.data))
+
+        self.assertEqual(text, expected)
+        self.assertEqual(structure, {
+            'total_paragraphs': len(doc.paragraphs),
+            'total_tables': len(doc.tables),
+            'total_sections': len(doc.sections),
+            'has_headers': True,
+            'has_footers': True
+        })
+
+    def test_iter_detect_offsets(self):
+        """Test streamed detections point into the extracted text."""
+        text = self.detector.extract_text_from_docx(io.BytesIO(self.data))
+
+        detections = list(self.detector.iter_detect_pii_in_docx(io.BytesIO(self.data)))
+
+        self.assertLessEqual({'PAN', 'AADHAAR'}, {d['type'] for d in detections})
+        for detection in detections:
+            # value is the pattern's capture group, within the matched span
+            self.assertIn(detection['value'], text[detection['start']:detection['end']])
+
+        # Same dict layout as detect_pii_in_docx
+        result = self.detector.detect_pii_in_docx(io.BytesIO(self.data))
+        self.assertEqual({tuple(d) for d in detections}, {tuple(d) for d in result['detections']})
+        self.assertEqual({d['category'] for d in detections}, {'UNKNOWN'})
+
+    def test_parse_cache(self):
+        """Test a path is parsed once until the file changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'sample.docx')
+            with open(path, 'wb') as f:
+                f.write(self.data)
+            pii_detector_docx._read_docx_file.cache_clear()
+
+            first = self.detector._parse_docx(path)
+            self.assertEqual(self.detector._parse_docx(path), first)
+            self.assertEqual(pii_detector_docx._read_docx_file.cache_info().hits, 1)
+
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(self.detector._parse_docx(path), first)
+            self.assertEqual(pii_detector_docx._read_docx_file.cache_info().misses, 2)
+
+    def test_detect_pii_in_docx(self):
+        """Test whole-text detections are categorized under UNKNOWN."""
+        result = self.detector.detect_pii_in_docx(io.BytesIO(self.data))
+
+        self.assertTrue(result['success'])
+        self.assertEqual(list(result['categorized']), ['UNKNOWN'])
+        self.assertEqual(sum(map(len, result['categorized']['UNKNOWN'].values())), result['total_pii_found'])
+        self.assertEqual(list(self.detector.iter_formatted_detections(io.BytesIO(self.data))),
+                         result['detections'])
+
+    def test_by_element_matches_per_element_scan(self):
+        """Test the joined scan gives each element its own detections and offsets."""
+        doc = Document(io.BytesIO(self.data))
+        result = self.detector.detect_pii_in_docx_by_element(io.BytesIO(self.data))
+
+        elements = result['element_detections']
+        self.assertEqual(list(elements), ['para_1', 'para_5', 'table_1_row_3'])
+        self.assertEqual(elements['para_1']['detections'], pii_detector.detect(doc.paragraphs[0].text))
+        row_text = " | ".join(cell.text for cell in doc.tables[0].rows[2].cells)
+        self.assertEqual(elements['table_1_row_3']['detections'], pii_detector.detect(row_text))
+
+    def test_by_element_shards(self):
+        """Test scanning in shards on the process pool gives the same result."""
+        stream = io.BytesIO(self.data)
+        expected = self.detector.detect_pii_in_docx_by_element(stream)
+
+        with patch.object(pii_detector_docx, '_PARALLEL_MIN_TEXT', 0), \
+                patch.object(pii_detector_docx, '_SHARD_TEXT', 20):
+            self.assertGreater(len(pii_detector_docx._shard_elements(['x' * 15] * 4)), 1)
+            actual = self.detector.detect_pii_in_docx_by_element(stream)
+
+        self.assertEqual(actual, expected)
+
+    def test_to_json_bytes(self):
+        """Test serialized results load back unchanged, with or without orjson."""
+        result = self.detector.detect_pii_in_docx_by_element(io.BytesIO(self.data))
+        result['file'] = 'sample.docx'
+
+        self.assertEqual(json.loads(self.detector.to_json_bytes(result)), result)
+        with patch.object(pii_detector_docx, 'orjson', None):
+            self.assertEqual(json.loads(self.detector.to_json_bytes(result)), result)
+
+    def test_not_a_docx(self):
+        """Test unreadable input yields no text."""
+        self.assertEqual(self.detector.extract_text_from_docx(io.BytesIO(b"not a zip")), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Unit tests for the label-based PII detector.
+"""
+import unittest
+from unittest.mock import patch
+
+import pii_detector_label_based
+from pii_detector_label_based import LabelBasedPIIDetector
+
+SAMPLE_TEXT = (
+    "Username: rahul_s, Password: s3cr3t!pass\n"
+    "Email: rahul.sharma@example.com\n"
+    "PAN: ABCDE1234F, Aadhaar: 4991 1866 5246\n"
+    "Mobile Number: +91 9876543210\n"
+    "IFSC: HDFC0001234, UPI: rahul@okaxis\n"
+    "Employee ID: EMP1234, Salary: ₹1,20,000\n"
+    "// API Key: sk_live_abc123\n"
+)
+
+
+class TestLabelPrefilter(unittest.TestCase):
+    """Test the trigger keyword prefilter."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.detector = LabelBasedPIIDetector()
+
+    def test_prefilter_matches_full_scan(self):
+        """Test skipping untriggered label types does not change results."""
+        # U+0130 and U+212A match "i" and "k" under re.IGNORECASE
+        for text in (SAMPLE_TEXT, SAMPLE_TEXT.upper(), "UİD: 4991 1866 5246 toKen: abc", "nothing"):
+            with patch.object(self.detector, '_candidate_labels', return_value=None):
+                expected = self.detector._detect_impl(text)
+
+            self.assertEqual(self.detector._detect_impl(text), expected)
+            # Substring search fallback without pyahocorasick
+            with patch.object(self.detector, 'trigger_automaton', None):
+                self.assertEqual(self.detector._detect_impl(text), expected)
+
+    def test_re2_matches_re(self):
+        """Test starting re at RE2's first match does not change results."""
+        # \x0b and \x1c are \s to re but not to RE2, so such text skips RE2
+        for text in (SAMPLE_TEXT, "uid:\x0b4991 1866 5246", "Name:\x1cRahul", "nothing"):
+            with patch.object(pii_detector_label_based, 're2', None):
+                expected = self.detector._detect_impl(text)
+
+            self.assertEqual(self.detector._detect_impl(text), expected)
+
+    def test_lowered_patterns_match_ignorecase(self):
+        """Test lowercased ASCII matching finds the same values, in original case."""
+        with patch.object(LabelBasedPIIDetector, '_compile_lowered', return_value=None):
+            reference = LabelBasedPIIDetector()
+
+        for text in (SAMPLE_TEXT, SAMPLE_TEXT.upper(), "pan: abcde1234f, Roll No: Sr202012345"):
+            self.assertEqual(self.detector._detect_impl(text), reference._detect_impl(text))
+
+    def test_detect_cache(self):
+        """Test repeated texts are served from the cache as fresh copies."""
+        self.detector.clear_cache()
+        first = self.detector.detect_pii("PAN: ABCDE1234F", page_num=1)
+        second = self.detector.detect_by_labels("PAN: ABCDE1234F")
+
+        self.assertNotIn('page', second[0])
+        self.assertEqual(first[0]['value'], second[0]['value'])
+        self.assertEqual(self.detector._detect_cached.cache_info().hits, 1)
+
+    def test_candidate_labels(self):
+        """Test only label types whose keywords occur are run."""
+        if self.detector.trigger_automaton is None:
+            self.skipTest("pyahocorasick not installed")
+        candidates = self.detector._candidate_labels("PAN: ABCDE1234F")
+
+        self.assertIn('PAN', candidates)
+        self.assertNotIn('AADHAAR', candidates)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -27,7 +27,7 @@ logger = logging.getLogger(__name__)
 
 # Try to import advanced detector for CSV and images
 try:
-    from pii_detector_advanced import advanced_pii_detector
+    from pii_detector_advanced import get_advanced_detector
     ADVANCED_DETECTOR_AVAILABLE = True
     logger.info("✅ Advanced detector available for CSV/Images")
 except ImportError:
@@ -297,7 +297,7 @@ def process_file(file_info: Dict[str, Any]) -> Dict[str, Any]:
                 logger.info(f"Using LABEL-BASED detector for {filename} ({file_ext})")
             elif file_ext == '.csv' or is_image_file(filename):
                 if ADVANCED_DETECTOR_AVAILABLE:
-                    selected_detector = advanced_pii_detector
+                    selected_detector = get_advanced_detector()
                     detector_name = "ADVANCED"
                     logger.info(f"Using ADVANCED detector for {filename} ({file_ext})")
                 else: